@@ -1,16 +1,16 @@
-from fastapi import Depends, HTTPException, status, Header
+from fastapi import Depends, HTTPException, status, Header, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from app.core.database import get_db
 from app.core.security import decode_access_token
-from app.models.user import User
-from app.models.tenant import Tenant
+from app.core.tenant_context import TenantContext
+from app.core.user_context import UserContext
+from app.services.user_cache import user_status_cache
 
 
 async def get_current_user(
     authorization: str = Header(None),
     db: AsyncSession = Depends(get_db)
-) -> User:
+) -> UserContext:
     """Get current authenticated user from JWT token"""
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(
@@ -34,10 +34,8 @@ async def get_current_user(
             detail="Invalid token"
         )
     
-    result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
-    user = result.scalar_one_or_none()
+    # Cached briefly; the database is only queried on a miss
+    user = await user_status_cache.get(user_id, db)
     
     if not user:
         raise HTTPException(
@@ -55,9 +53,8 @@ async def get_current_user(
 
 
 async def get_current_tenant(
-    request,
-    db: AsyncSession = Depends(get_db)
-) -> Tenant:
+    request: Request
+) -> TenantContext:
     """Get current tenant from request state (set by middleware)"""
     tenant = getattr(request.state, "tenant", None)
     
@@ -71,9 +68,9 @@ async def get_current_tenant(
 
 
 async def get_tenant_owner(
-    tenant: Tenant = Depends(get_current_tenant),
-    user: User = Depends(get_current_user)
-) -> Tenant:
+    tenant: TenantContext = Depends(get_current_tenant),
+    user: UserContext = Depends(get_current_user)
+) -> TenantContext:
     """Verify user owns the tenant"""
     if tenant.owner_id != user.id:
         raise HTTPException(
@@ -83,3 +80,16 @@ async def get_tenant_owner(
     
     return tenant
 
+
+
+async def get_superuser(
+    user: UserContext = Depends(get_current_user)
+) -> UserContext:
+    """Verify the user is a platform superuser"""
+    if not user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized"
+        )
+    
+    return user
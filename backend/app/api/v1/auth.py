@@ -1,40 +1,55 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.security import verify_password, get_password_hash, create_access_token, decode_access_token
+from app.core.security import (
+    verify_password_async, get_password_hash_async, create_access_token, decode_access_token, PasswordHashingBusy
+)
 from app.schemas.auth import OTPRequest, OTPVerify, PasswordLogin, TokenResponse, UserCreate, UserResponse
 from app.models.user import User
 from app.services.otp import OTPService
-import random
-import string
+from app.services.otp_store import get_otp_store, OTPResult
+import secrets
 
 router = APIRouter()
 
 
+def raise_hashing_busy():
+    """Reject a login/register quickly while password hashing is saturated"""
+    raise HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server busy, please try again",
+        headers={"Retry-After": "1"}
+    )
+
+
 @router.post("/otp/request", response_model=dict)
 async def request_otp(
-    request: OTPRequest,
-    db: AsyncSession = Depends(get_db)
+    request: OTPRequest
 ):
     """Request OTP for phone number login"""
     # Generate 6-digit OTP
-    otp = ''.join(random.choices(string.digits, k=6))
+    otp = f"{secrets.randbelow(10 ** 6):06d}"
     
-    # Store OTP (in production, use Redis with expiration)
-    # For now, we'll use a simple in-memory store or database
-    # TODO: Implement Redis-based OTP storage
+    # Store OTP with expiry; refused while the resend cooldown is running
+    retry_after = await get_otp_store().issue(request.phone, otp)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Please wait before requesting another OTP",
+            headers={"Retry-After": str(retry_after)}
+        )
     
     # Send OTP via SMS service
     otp_service = OTPService()
     await otp_service.send_otp(request.phone, otp)
     
-    # In development, return OTP for testing
-    # Remove this in production!
-    if True:  # Set to False in production
+    # Only development builds echo the code back, for testing without SMS
+    if settings.DEBUG or settings.ENVIRONMENT == "development":
         return {
             "message": "OTP sent successfully",
-            "otp": otp  # Remove in production
+            "otp": otp
         }
     
     return {"message": "OTP sent successfully"}
@@ -46,9 +61,20 @@ async def verify_otp(
     db: AsyncSession = Depends(get_db)
 ):
     """Verify OTP and login/register user"""
-    # Verify OTP (in production, check against Redis)
-    # For now, accept any 6-digit code in development
-    # TODO: Implement proper OTP verification
+    # Verify OTP before touching the database; a valid code is consumed
+    otp_result = await get_otp_store().verify(request.phone, request.otp)
+    
+    if otp_result == OTPResult.TOO_MANY_ATTEMPTS:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many attempts, please request a new OTP"
+        )
+    
+    if otp_result != OTPResult.VALID:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired OTP"
+        )
     
     # Check if user exists
     result = await db.execute(
@@ -112,7 +138,12 @@ async def login(
             detail="Invalid credentials"
         )
     
-    if not verify_password(request.password, user.hashed_password):
+    try:
+        password_valid = await verify_password_async(request.password, user.hashed_password)
+    except PasswordHashingBusy:
+        raise_hashing_busy()
+    
+    if not password_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
@@ -159,12 +190,19 @@ async def register(
             detail="User with this phone number already exists"
         )
     
+    hashed_password = None
+    if user_data.password:
+        try:
+            hashed_password = await get_password_hash_async(user_data.password)
+        except PasswordHashingBusy:
+            raise_hashing_busy()
+    
     # Create new user
     user = User(
         phone=user_data.phone,
         email=user_data.email,
         full_name=user_data.full_name,
-        hashed_password=get_password_hash(user_data.password) if user_data.password else None,
+        hashed_password=hashed_password,
         is_active=True
     )
     
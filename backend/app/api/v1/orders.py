@@ -1,68 +1,133 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query, Header
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc
-from typing import List, Optional
-from app.core.database import get_db
-from app.schemas.order import OrderCreate, OrderUpdate, OrderResponse, OrderItemResponse
-from app.models.order import Order, OrderItem, OrderStatus
+from sqlalchemy import select, update, case, func, desc, tuple_, any_, bindparam, Integer, ARRAY
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import selectinload
+from typing import Dict, List, Optional
+from app.core.database import get_db, is_lock_conflict
+from app.core.pagination import encode_cursor, decode_cursor
+from app.schemas.order import (
+    OrderCreate,
+    OrderUpdate,
+    OrderResponse,
+    OrderItemResponse,
+    OrderPage,
+    OrderBulkStatusUpdate,
+    OrderBulkStatusResult,
+    OrderBulkStatusResponse,
+)
+from app.models.order import Order, OrderItem, OrderStatus, ORDER_STATUS_TRANSITIONS
 from app.models.product import Product
-from app.models.tenant import Tenant
-from app.models.shipping import ShippingClass
+from app.core.tenant_context import TenantContext
 from app.api.v1.tenants import get_current_user_id
 from app.api.v1.products import get_tenant_from_request
-from app.services.email import EmailService
-from app.services.whatsapp import WhatsAppService
-from app.services.facebook_pixel import FacebookPixelService
+from app.services.order_number import order_number_generator, OrderNumbersUnavailable
+from app.services.shipping_cache import shipping_cache
+from app.services.catalog import catalog_versions
+from app.services.order_notifications import enqueue_order_notifications
+from app.services.order_export import build_export_query, export_orders_csv, export_orders_ndjson
+from app.services.idempotency import (
+    get_idempotency_store,
+    request_fingerprint,
+    IdempotencyKeyReused,
+    IdempotencyKeyInFlight,
+    StoredResponse,
+)
+from collections import defaultdict
+from datetime import datetime
 from decimal import Decimal
-import string
-import random
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
 def generate_order_number() -> str:
-    """Generate unique order number"""
-    prefix = "ORD"
-    random_part = ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
-    return f"{prefix}-{random_part}"
+    """Generate unique order number (see app.services.order_number)"""
+    try:
+        return order_number_generator.next()
+    except OrderNumbersUnavailable as e:
+        logger.error(f"Cannot generate order numbers: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Orders are temporarily unavailable, please try again",
+            headers={"Retry-After": "5"}
+        )
 
 
-@router.post("", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
-async def create_order(
-    order_data: OrderCreate,
-    request: Request,
-    background_tasks: BackgroundTasks,
-    db: AsyncSession = Depends(get_db)
-):
-    """Create a new order (public endpoint)"""
-    tenant = get_tenant_from_request(request)
+async def reserve_stock(db: AsyncSession, tenant_id: int, quantities: Dict[int, int]) -> List[int]:
+    """
+    Atomically decrement stock for every product of an order.
+    
+    The product rows are locked in id order first, so checkouts sharing
+    products queue up on the same first row instead of deadlocking on each
+    other. Then one conditional UPDATE covers the whole order and only
+    touches rows that still have enough stock, so concurrent checkouts
+    can't oversell or lose updates. Returns the ids of products that could
+    not be reserved; the caller must roll back if any are returned.
+    """
+    if not quantities:
+        return []
     
-    if not tenant:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Tenant context required"
+    product_ids = sorted(quantities)
+    
+    await db.execute(
+        select(Product.id)
+        .where(Product.id.in_(product_ids), Product.tenant_id == tenant_id)
+        .order_by(Product.id)
+        .with_for_update()
+    )
+    
+    quantity = case(quantities, value=Product.id)
+    
+    result = await db.execute(
+        update(Product)
+        .where(
+            Product.id.in_(product_ids),
+            Product.tenant_id == tenant_id,
+            Product.stock_quantity >= quantity
+        )
+        .values(
+            stock_quantity=Product.stock_quantity - quantity,
+            is_in_stock=Product.stock_quantity - quantity > 0
         )
+        .returning(Product.id)
+        .execution_options(synchronize_session=False)
+    )
+    reserved = set(result.scalars().all())
     
+    return [product_id for product_id in quantities if product_id not in reserved]
+
+
+async def place_order(order_data: OrderCreate, tenant: TenantContext, db: AsyncSession) -> Order:
+    """Validate the cart, reserve stock and save the order with its items"""
     if not tenant.enable_cod and order_data.payment_method == "cod":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cash on delivery not enabled for this store"
         )
     
+    # Load every product in the cart with a single query
+    result = await db.execute(
+        select(Product).where(
+            Product.id.in_({item.product_id for item in order_data.items}),
+            Product.tenant_id == tenant.id,
+            Product.is_published == True
+        )
+    )
+    products = {product.id: product for product in result.scalars().all()}
+    
     # Calculate order totals
     subtotal = Decimal("0")
     order_items_data = []
+    # Quantity per product so far, in case a product appears on several lines
+    requested_quantities = defaultdict(int)
     
     for item_data in order_data.items:
-        # Get product
-        result = await db.execute(
-            select(Product).where(
-                Product.id == item_data.product_id,
-                Product.tenant_id == tenant.id,
-                Product.is_published == True
-            )
-        )
-        product = result.scalar_one_or_none()
+        product = products.get(item_data.product_id)
         
         if not product:
             raise HTTPException(
@@ -70,7 +135,9 @@ async def create_order(
                 detail=f"Product {item_data.product_id} not found"
             )
         
-        if not product.is_in_stock or (product.track_inventory and product.stock_quantity < item_data.quantity):
+        requested_quantities[product.id] += item_data.quantity
+        
+        if not product.is_in_stock or (product.track_inventory and product.stock_quantity < requested_quantities[product.id]):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Insufficient stock for product {product.title}"
@@ -88,18 +155,10 @@ async def create_order(
             "subtotal": item_subtotal
         })
     
-    # Get shipping cost
+    # Get shipping cost (from the per-tenant cache, no query on a hit)
     shipping_cost = Decimal("0")
-    shipping_class = None
     if order_data.shipping_class_id:
-        result = await db.execute(
-            select(ShippingClass).where(
-                ShippingClass.id == order_data.shipping_class_id,
-                ShippingClass.tenant_id == tenant.id,
-                ShippingClass.is_active == True
-            )
-        )
-        shipping_class = result.scalar_one_or_none()
+        shipping_class = await shipping_cache.get_active(tenant.id, order_data.shipping_class_id, db)
         if shipping_class:
             shipping_cost = shipping_class.cost
     
@@ -122,139 +181,141 @@ async def create_order(
         notes=order_data.notes,
         fb_pixel_id=order_data.fb_pixel_id,
         fb_event_id=order_data.fb_event_id,
-        status=OrderStatus.PENDING
+        status=OrderStatus.PENDING,
+        items=[
+            OrderItem(
+                product_id=item_data["product"].id,
+                product_title=item_data["product"].title,
+                product_price=item_data["price"],
+                quantity=item_data["quantity"],
+                subtotal=item_data["subtotal"]
+            )
+            for item_data in order_items_data
+        ]
     )
     
+    # One INSERT for the order and one for all its items; ids and created_at
+    # come back through RETURNING (Order has eager_defaults)
     db.add(order)
-    await db.flush()  # Get order ID
-    
-    # Create order items and update stock
-    for item_data in order_items_data:
-        order_item = OrderItem(
-            order_id=order.id,
-            product_id=item_data["product"].id,
-            product_title=item_data["product"].title,
-            product_price=item_data["price"],
-            quantity=item_data["quantity"],
-            subtotal=item_data["subtotal"]
-        )
-        db.add(order_item)
+    # Notifications go out from the outbox worker once this commits
+    enqueue_order_notifications(db, tenant, order, order_data.fb_pixel_id, order_data.fb_event_id)
+    await db.flush()
+    
+    # Reserve stock last, so the product rows stay locked only until commit
+    tracked_quantities = {
+        product_id: quantity
+        for product_id, quantity in requested_quantities.items()
+        if products[product_id].track_inventory
+    }
+    try:
+        unavailable = await reserve_stock(db, tenant.id, tracked_quantities)
+        if unavailable:
+            # Rolling back expires the loaded products, so read the title first
+            title = products[unavailable[0]].title
+            await db.rollback()
+            # Same answer as the check above; it just lost a race
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Insufficient stock for product {title}"
+            )
         
-        # Update product stock
-        if item_data["product"].track_inventory:
-            item_data["product"].stock_quantity -= item_data["quantity"]
-            if item_data["product"].stock_quantity <= 0:
-                item_data["product"].is_in_stock = False
-    
-    await db.commit()
-    await db.refresh(order)
-    
-    # Load order items for response
-    result = await db.execute(
-        select(OrderItem).where(OrderItem.order_id == order.id)
-    )
-    order.items = result.scalars().all()
-    
-    # Send notifications in background
-    if tenant.email_notifications and tenant.notification_email:
-        background_tasks.add_task(
-            send_order_notification_email,
-            tenant,
-            order
-        )
-    
-    if tenant.whatsapp_notifications and tenant.notification_whatsapp:
-        background_tasks.add_task(
-            send_order_notification_whatsapp,
-            tenant,
-            order
+        # Sessions don't expire on commit, so the response is built from the
+        # order and items already in memory, without reading them back
+        await db.commit()
+    except DBAPIError as e:
+        if not is_lock_conflict(e):
+            raise
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Stock is being updated by another order, please try again",
+            headers={"Retry-After": "1"}
         )
     
-    # Track Facebook Pixel event
-    if tenant.enable_facebook_pixel and tenant.facebook_access_token and order_data.fb_pixel_id:
-        background_tasks.add_task(
-            track_facebook_pixel_purchase,
-            tenant,
-            order,
-            order_data.fb_event_id
-        )
+    # Storefront pages show stock levels
+    if tracked_quantities:
+        await catalog_versions.bump(tenant.id)
     
     return order
 
 
-async def send_order_notification_email(tenant: Tenant, order: Order):
-    """Send email notification to store owner"""
-    email_service = EmailService()
-    
-    subject = "নতুন অর্ডার এসেছে"  # New order received
-    
-    html_body = f"""
-    <html>
-    <body style="font-family: Arial, sans-serif;">
-        <h2>নতুন অর্ডার এসেছে</h2>
-        <p>আপনার স্টোরে একটি নতুন অর্ডার এসেছে।</p>
-        <p><strong>অর্ডার নম্বর:</strong> {order.order_number}</p>
-        <p><strong>গ্রাহকের নাম:</strong> {order.customer_name}</p>
-        <p><strong>মোবাইল নম্বর:</strong> {order.customer_phone}</p>
-        <p><strong>ঠিকানা:</strong> {order.customer_address}</p>
-        <p><strong>মোট পরিমাণ:</strong> {order.total} {tenant.currency}</p>
-    </body>
-    </html>
+@router.post("", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
+async def create_order(
+    order_data: OrderCreate,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
     """
+    Create a new order (public endpoint).
     
-    await email_service.send_email(
-        tenant.notification_email,
-        subject,
-        html_body
-    )
-
-
-async def send_order_notification_whatsapp(tenant: Tenant, order: Order):
-    """Send WhatsApp notification to store owner"""
-    whatsapp_service = WhatsAppService()
+    Clients may send an Idempotency-Key header to retry safely: the first
+    successful response is stored per store and key, and a retry with the
+    same key and body gets that response back (with Idempotent-Replayed:
+    true) without placing another order. A duplicate that arrives while
+    the first request is still running waits for it.
+    """
+    tenant = get_tenant_from_request(request)
     
-    message = f"""নতুন অর্ডার এসেছে
-
-অর্ডার নম্বর: {order.order_number}
-গ্রাহকের নাম: {order.customer_name}
-মোবাইল: {order.customer_phone}
-ঠিকানা: {order.customer_address}
-মোট: {order.total} {tenant.currency}"""
-    
-    await whatsapp_service.send_message(
-        tenant.notification_whatsapp,
-        message
-    )
-
-
-async def track_facebook_pixel_purchase(tenant: Tenant, order: Order, event_id: str):
-    """Track purchase event via Facebook Pixel"""
-    pixel_service = FacebookPixelService()
-    
-    # Get product IDs from order items
-    content_ids = [str(item.product_id) for item in order.items]
-    
-    event_data = {
-        "event_time": int(order.created_at.timestamp()),
-        "event_id": event_id or f"order_{order.id}",
-        "event_source_url": f"https://{tenant.slug}.{tenant.slug}/order/{order.id}",
-        "user_data": {
-            "phone": order.customer_phone,
-            "email": order.customer_email
-        },
-        "custom_data": {
-            "value": float(order.total),
-            "currency": tenant.currency,
-            "content_ids": content_ids,
-            "num_items": sum(item.quantity for item in order.items)
-        }
-    }
+    if not tenant:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Tenant context required"
+        )
     
-    await pixel_service.track_purchase(
-        tenant.facebook_pixel_id,
-        tenant.facebook_access_token,
-        event_data
-    )
+    if idempotency_key is None:
+        order = await place_order(order_data, tenant, db)
+    else:
+        if not idempotency_key.strip() or len(idempotency_key) > 255:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid Idempotency-Key"
+            )
+        
+        store = get_idempotency_store()
+        key = f"idempotency:orders:{tenant.id}:{idempotency_key}"
+        fingerprint = request_fingerprint(order_data.dict())
+        owner = uuid.uuid4().hex
+        
+        try:
+            stored = await store.claim(key, fingerprint, owner)
+        except IdempotencyKeyReused:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different order"
+            )
+        except IdempotencyKeyInFlight:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="An order with this Idempotency-Key is still being processed",
+                headers={"Retry-After": "1"}
+            )
+        
+        if stored is not None:
+            return JSONResponse(
+                status_code=stored.status_code,
+                content=stored.body,
+                headers={"Idempotent-Replayed": "true"}
+            )
+        
+        # Failed attempts are not stored, so the client can retry with the same key
+        try:
+            order = await place_order(order_data, tenant, db)
+        except Exception:
+            await store.release(key, owner)
+            raise
+        
+        # The order is committed by now; failing to store the response must
+        # not turn it into an error the client would retry
+        try:
+            await store.complete(key, fingerprint, owner, StoredResponse(
+                status_code=status.HTTP_201_CREATED,
+                body=OrderResponse.model_validate(order).model_dump(mode="json")
+            ))
+        except Exception as e:
+            logger.error(f"Failed to store idempotent response for order {order.order_number}: {e}")
+    
+    return order
 
 
 @router.get("", response_model=List[OrderResponse])
@@ -275,24 +336,123 @@ async def list_orders(
             detail="Not authorized"
         )
     
-    query = select(Order).where(Order.tenant_id == tenant.id)
+    # Items for the whole page come from one extra IN query
+    query = (
+        select(Order)
+        .options(selectinload(Order.items))
+        .where(Order.tenant_id == tenant.id)
+    )
     
     if status_filter:
         query = query.where(Order.status == status_filter)
     
-    query = query.order_by(desc(Order.created_at)).limit(limit).offset(offset)
+    query = query.order_by(desc(Order.created_at), desc(Order.id)).limit(limit).offset(offset)
     
     result = await db.execute(query)
     orders = result.scalars().all()
     
-    # Load items for each order
-    for order in orders:
-        items_result = await db.execute(
-            select(OrderItem).where(OrderItem.order_id == order.id)
+    return orders
+
+
+@router.get("/page", response_model=OrderPage)
+async def list_orders_page(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user_id),
+    status_filter: Optional[OrderStatus] = None,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None
+):
+    """
+    List orders for tenant (owner only), newest first, by cursor.
+    
+    Pass next_cursor from the previous page to get the next one; it is None
+    on the last page. Pages seek on (created_at, id) through the
+    ix_orders_tenant_created_id index, so deep pages cost the same as the
+    first and new orders don't shift rows between pages.
+    """
+    tenant = get_tenant_from_request(request)
+    
+    if not tenant or tenant.owner_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized"
         )
-        order.items = items_result.scalars().all()
     
-    return orders
+    query = (
+        select(Order)
+        .options(selectinload(Order.items))
+        .where(Order.tenant_id == tenant.id)
+    )
+    
+    if status_filter:
+        query = query.where(Order.status == status_filter)
+    
+    if cursor:
+        created_at, last_id = decode_cursor(cursor, 2)
+        try:
+            created_at = datetime.fromisoformat(created_at)
+            last_id = int(last_id)
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        query = query.where(tuple_(Order.created_at, Order.id) < tuple_(created_at, last_id))
+    
+    # One extra row tells us whether there is a next page
+    query = query.order_by(desc(Order.created_at), desc(Order.id)).limit(limit + 1)
+    
+    result = await db.execute(query)
+    orders = result.scalars().all()
+    
+    next_cursor = None
+    if len(orders) > limit:
+        orders = orders[:limit]
+        last = orders[-1]
+        next_cursor = encode_cursor([last.created_at.isoformat(), last.id])
+    
+    return OrderPage(items=orders, next_cursor=next_cursor)
+
+
+@router.get("/export")
+async def export_orders(
+    request: Request,
+    user_id: int = Depends(get_current_user_id),
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    created_from: Optional[datetime] = Query(None, alias="from"),
+    created_to: Optional[datetime] = Query(None, alias="to"),
+    status_filter: Optional[OrderStatus] = Query(None, alias="status")
+):
+    """
+    Export orders as CSV or NDJSON (owner only).
+    
+    Rows are streamed from a server-side cursor as they are read, so memory
+    stays flat whatever the size of the store and the download starts
+    right away. from is inclusive and to is exclusive.
+    """
+    tenant = get_tenant_from_request(request)
+    
+    if not tenant or tenant.owner_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized"
+        )
+    
+    query = build_export_query(tenant.id, status_filter, created_from, created_to)
+    
+    if export_format == "ndjson":
+        return StreamingResponse(
+            export_orders_ndjson(query),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": f'attachment; filename="orders-{tenant.slug}.ndjson"'}
+        )
+    
+    return StreamingResponse(
+        export_orders_csv(query),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="orders-{tenant.slug}.csv"'}
+    )
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
@@ -312,7 +472,9 @@ async def get_order(
         )
     
     result = await db.execute(
-        select(Order).where(
+        select(Order)
+        .options(selectinload(Order.items))
+        .where(
             Order.id == order_id,
             Order.tenant_id == tenant.id
         )
@@ -325,12 +487,6 @@ async def get_order(
             detail="Order not found"
         )
     
-    # Load items
-    items_result = await db.execute(
-        select(OrderItem).where(OrderItem.order_id == order.id)
-    )
-    order.items = items_result.scalars().all()
-    
     return order
 
 
@@ -352,7 +508,9 @@ async def update_order(
         )
     
     result = await db.execute(
-        select(Order).where(
+        select(Order)
+        .options(selectinload(Order.items))
+        .where(
             Order.id == order_id,
             Order.tenant_id == tenant.id
         )
@@ -370,14 +528,110 @@ async def update_order(
     for key, value in update_data.items():
         setattr(order, key, value)
     
+    # Sessions don't expire on commit, so the loaded order and items can be returned as is
     await db.commit()
-    await db.refresh(order)
-    
-    # Load items
-    items_result = await db.execute(
-        select(OrderItem).where(OrderItem.order_id == order.id)
-    )
-    order.items = items_result.scalars().all()
     
     return order
 
+
+
+@router.post("/bulk-status", response_model=OrderBulkStatusResponse)
+async def bulk_update_order_status(
+    bulk_data: OrderBulkStatusUpdate,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user_id)
+):
+    """
+    Move many orders to a new status at once (owner only).
+    
+    Takes order_ids, a from_status filter, or both. Every order whose
+    current status may move to the target (see ORDER_STATUS_TRANSITIONS) is
+    updated by one UPDATE statement; with order_ids, the rest are reported
+    per id as unchanged, invalid_transition or not_found.
+    """
+    tenant = get_tenant_from_request(request)
+    
+    if not tenant or tenant.owner_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized"
+        )
+    
+    if bulk_data.order_ids is None and bulk_data.from_status is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Either order_ids or from_status is required"
+        )
+    
+    target = bulk_data.status
+    allowed_from = [
+        current for current, targets in ORDER_STATUS_TRANSITIONS.items()
+        if target in targets
+    ]
+    if bulk_data.from_status is not None:
+        if bulk_data.from_status not in allowed_from:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot change orders from {bulk_data.from_status.value} to {target.value}"
+            )
+        allowed_from = [bulk_data.from_status]
+    
+    if not allowed_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"No order can be changed to {target.value}"
+        )
+    
+    stmt = (
+        update(Order)
+        .where(
+            Order.tenant_id == tenant.id,
+            Order.status.in_(allowed_from)
+        )
+        .values(status=target)
+        .returning(Order.id)
+        .execution_options(synchronize_session=False)
+    )
+    
+    order_ids = None
+    if bulk_data.order_ids is not None:
+        order_ids = list(dict.fromkeys(bulk_data.order_ids))
+        # One array parameter instead of a bind parameter per id
+        stmt = stmt.where(Order.id == any_(bindparam("order_ids", order_ids, type_=ARRAY(Integer))))
+    
+    result = await db.execute(stmt)
+    updated_ids = result.scalars().all()
+    
+    results = [
+        OrderBulkStatusResult(order_id=order_id, result="updated", status=target)
+        for order_id in sorted(updated_ids)
+    ]
+    
+    if order_ids is not None:
+        # Explain the ids that were left alone
+        updated = set(updated_ids)
+        remaining = [order_id for order_id in order_ids if order_id not in updated]
+        current_statuses = {}
+        if remaining:
+            result = await db.execute(
+                select(Order.id, Order.status).where(
+                    Order.tenant_id == tenant.id,
+                    Order.id == any_(bindparam("remaining_ids", remaining, type_=ARRAY(Integer)))
+                )
+            )
+            current_statuses = dict(result.all())
+        
+        for order_id in remaining:
+            current = current_statuses.get(order_id)
+            if current is None:
+                outcome = "not_found"
+            elif current == target:
+                outcome = "unchanged"
+            else:
+                outcome = "invalid_transition"
+            results.append(OrderBulkStatusResult(order_id=order_id, result=outcome, status=current))
+    
+    await db.commit()
+    
+    return OrderBulkStatusResponse(status=target, updated=len(updated_ids), results=results)
@@ -1,18 +1,67 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, tuple_
+from sqlalchemy.orm import load_only
 from typing import List, Optional
+from pydantic import TypeAdapter
 from app.core.database import get_db
-from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.slugs import slugify
+from app.schemas.product import (
+    ProductCreate,
+    ProductUpdate,
+    ProductResponse,
+    ProductSummary,
+    ProductPage,
+    ProductImportResponse,
+)
 from app.models.product import Product
-from app.models.tenant import Tenant
+from app.core.tenant_context import TenantContext
+from app.services.product_search import product_search_clauses
+from app.services.product_import import import_products
+from app.services.catalog import catalog_versions, catalog_validators, catalog_responses
 from app.api.v1.tenants import get_current_user_id
-import re
+from datetime import datetime
+from decimal import Decimal
 
 router = APIRouter()
 
+# What customers pay: the discount price when there is one (same rule as checkout)
+effective_price = func.coalesce(func.nullif(Product.discount_price, 0), Product.price)
 
-def get_tenant_from_request(request: Request) -> Optional[Tenant]:
+# Serializers for cached storefront responses, matching each route's response_model
+PRODUCT_RESPONSE = TypeAdapter(ProductResponse)
+PRODUCT_LIST_RESPONSE = TypeAdapter(List[ProductResponse])
+PRODUCT_PAGE_RESPONSE = TypeAdapter(ProductPage)
+PRODUCT_SUMMARY_LIST_RESPONSE = TypeAdapter(List[ProductSummary])
+
+# Only what listing pages show
+PRODUCT_SUMMARY_COLUMNS = [getattr(Product, field) for field in ProductSummary.model_fields]
+
+# Sort key columns per sort option, each with its cursor parser and a getter
+# for a loaded product; every sort ends with id so the key is unique
+PRODUCT_SORTS = {
+    "newest": (True, [
+        (Product.created_at, datetime.fromisoformat, lambda p: p.created_at.isoformat()),
+        (Product.id, int, lambda p: p.id),
+    ]),
+    "featured": (True, [
+        (Product.is_featured, bool, lambda p: bool(p.is_featured)),
+        (Product.created_at, datetime.fromisoformat, lambda p: p.created_at.isoformat()),
+        (Product.id, int, lambda p: p.id),
+    ]),
+    "price_asc": (False, [
+        (effective_price, Decimal, lambda p: str(p.discount_price or p.price)),
+        (Product.id, int, lambda p: p.id),
+    ]),
+    "price_desc": (True, [
+        (effective_price, Decimal, lambda p: str(p.discount_price or p.price)),
+        (Product.id, int, lambda p: p.id),
+    ]),
+}
+
+
+def get_tenant_from_request(request: Request) -> Optional[TenantContext]:
     """Get tenant from request state (set by middleware)"""
     return getattr(request.state, "tenant", None)
 
@@ -43,8 +92,7 @@ async def create_product(
     # Generate slug if not provided
     slug = product_data.slug
     if not slug:
-        slug = re.sub(r'[^a-z0-9]+', '-', product_data.title.lower())
-        slug = re.sub(r'^-+|-+$', '', slug)
+        slug = slugify(product_data.title)
     
     # Check if slug exists
     result = await db.execute(
@@ -68,17 +116,50 @@ async def create_product(
     db.add(product)
     await db.commit()
     await db.refresh(product)
+    await catalog_versions.bump(tenant.id)
     
     return product
 
 
-@router.get("", response_model=List[ProductResponse])
+@router.post("/import", response_model=ProductImportResponse)
+async def import_products_file(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user_id),
+    import_format: str = Query("csv", alias="format", pattern="^(csv|jsonl|ndjson)$")
+):
+    """
+    Import products from a CSV or JSON Lines request body (owner only).
+    
+    CSV needs a header line of product field names (see ProductCreate),
+    with image URLs separated by "|"; JSON Lines has one product object
+    per line. Slugs are generated like create_product's and made unique.
+    Invalid rows are skipped and listed in errors with their line number;
+    every other row is imported.
+    """
+    tenant = get_tenant_from_request(request)
+    
+    if not tenant or tenant.owner_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized"
+        )
+    
+    imported, errors = await import_products(db, tenant.id, request, import_format)
+    if imported:
+        await catalog_versions.bump(tenant.id)
+    
+    return ProductImportResponse(imported=imported, failed=len(errors), errors=errors)
+
+
+@router.get("", response_model=List[ProductResponse], deprecated=True)
 async def list_products(
     request: Request,
     db: AsyncSession = Depends(get_db),
-    published_only: bool = True
+    published_only: bool = True,
+    limit: int = Query(100, ge=1, le=500)
 ):
-    """List products (tenant-scoped)"""
+    """List the newest products (tenant-scoped); deprecated, page with /products/page instead"""
     tenant = get_tenant_from_request(request)
     
     if not tenant:
@@ -87,15 +168,153 @@ async def list_products(
             detail="Tenant context required"
         )
     
+    validators = await catalog_validators(request, tenant.id, published_only=published_only, limit=limit)
+    if validators.not_modified:
+        return validators.not_modified_response()
+    cached = catalog_responses.get(validators)
+    if cached is not None:
+        return cached
+    
     query = select(Product).where(Product.tenant_id == tenant.id)
     
     if published_only:
         query = query.where(Product.is_published == True)
     
-    result = await db.execute(query.order_by(Product.created_at.desc()))
+    result = await db.execute(query.order_by(Product.created_at.desc(), Product.id.desc()).limit(limit))
     products = result.scalars().all()
     
-    return products
+    return catalog_responses.store(validators, PRODUCT_LIST_RESPONSE, products)
+
+
+@router.get("/page", response_model=ProductPage)
+async def list_products_page(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    published_only: bool = True,
+    sort: str = Query("newest", pattern="^(newest|featured|price_asc|price_desc)$"),
+    is_featured: Optional[bool] = None,
+    is_in_stock: Optional[bool] = None,
+    limit: int = Query(24, ge=1, le=100),
+    cursor: Optional[str] = None
+):
+    """
+    List products a page at a time (tenant-scoped).
+    
+    Returns listing fields only (see ProductSummary) and a next_cursor to
+    pass back for the next page, None on the last one. Pages seek on the
+    sort key instead of using OFFSET, so every page costs the same.
+    """
+    tenant = get_tenant_from_request(request)
+    
+    if not tenant:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Tenant context required"
+        )
+    
+    validators = await catalog_validators(
+        request,
+        tenant.id,
+        published_only=published_only,
+        sort=sort,
+        is_featured=is_featured,
+        is_in_stock=is_in_stock,
+        limit=limit,
+        cursor=cursor
+    )
+    if validators.not_modified:
+        return validators.not_modified_response()
+    cached = catalog_responses.get(validators)
+    if cached is not None:
+        return cached
+    
+    descending, sort_key = PRODUCT_SORTS[sort]
+    
+    query = (
+        select(Product)
+        .options(load_only(*PRODUCT_SUMMARY_COLUMNS, Product.created_at))
+        .where(Product.tenant_id == tenant.id)
+    )
+    
+    if published_only:
+        query = query.where(Product.is_published == True)
+    if is_featured is not None:
+        query = query.where(Product.is_featured == is_featured)
+    if is_in_stock is not None:
+        query = query.where(Product.is_in_stock == is_in_stock)
+    
+    if cursor:
+        raw_values = decode_cursor(cursor, len(sort_key))
+        try:
+            values = [parse(value) for (_, parse, _), value in zip(sort_key, raw_values)]
+        except (TypeError, ValueError, ArithmeticError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        key = tuple_(*[column for column, _, _ in sort_key])
+        query = query.where(key < tuple_(*values) if descending else key > tuple_(*values))
+    
+    order_by = [column.desc() if descending else column.asc() for column, _, _ in sort_key]
+    
+    # One extra row tells us whether there is a next page
+    result = await db.execute(query.order_by(*order_by).limit(limit + 1))
+    products = result.scalars().all()
+    
+    next_cursor = None
+    if len(products) > limit:
+        products = products[:limit]
+        next_cursor = encode_cursor([value(products[-1]) for _, _, value in sort_key])
+    
+    return catalog_responses.store(
+        validators, PRODUCT_PAGE_RESPONSE, ProductPage(items=products, next_cursor=next_cursor)
+    )
+
+
+@router.get("/search", response_model=List[ProductSummary])
+async def search_products(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=1000),
+    db: AsyncSession = Depends(get_db)
+):
+    """Search published products by title and description, best matches first (public endpoint)"""
+    tenant = get_tenant_from_request(request)
+    
+    if not tenant:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Tenant context required"
+        )
+    
+    q = q.strip()
+    validators = await catalog_validators(request, tenant.id, q=q, limit=limit, offset=offset)
+    if validators.not_modified:
+        return validators.not_modified_response()
+    cached = catalog_responses.get(validators)
+    if cached is not None:
+        return cached
+    
+    if not q:
+        return catalog_responses.store(validators, PRODUCT_SUMMARY_LIST_RESPONSE, [])
+    
+    matches, rank = product_search_clauses(q)
+    
+    result = await db.execute(
+        select(Product)
+        .options(load_only(*PRODUCT_SUMMARY_COLUMNS))
+        .where(
+            Product.tenant_id == tenant.id,
+            Product.is_published == True,
+            matches
+        )
+        .order_by(rank.desc(), Product.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    
+    return catalog_responses.store(validators, PRODUCT_SUMMARY_LIST_RESPONSE, result.scalars().all())
 
 
 @router.get("/{product_id}", response_model=ProductResponse)
@@ -113,6 +332,13 @@ async def get_product(
             detail="Tenant context required"
         )
     
+    validators = await catalog_validators(request, tenant.id, product_id=product_id)
+    if validators.not_modified:
+        return validators.not_modified_response()
+    cached = catalog_responses.get(validators)
+    if cached is not None:
+        return cached
+    
     result = await db.execute(
         select(Product).where(
             Product.id == product_id,
@@ -127,7 +353,7 @@ async def get_product(
             detail="Product not found"
         )
     
-    return product
+    return catalog_responses.store(validators, PRODUCT_RESPONSE, product)
 
 
 @router.get("/slug/{slug}", response_model=ProductResponse)
@@ -145,6 +371,13 @@ async def get_product_by_slug(
             detail="Tenant context required"
         )
     
+    validators = await catalog_validators(request, tenant.id, slug=slug)
+    if validators.not_modified:
+        return validators.not_modified_response()
+    cached = catalog_responses.get(validators)
+    if cached is not None:
+        return cached
+    
     result = await db.execute(
         select(Product).where(
             Product.slug == slug,
@@ -160,7 +393,7 @@ async def get_product_by_slug(
             detail="Product not found"
         )
     
-    return product
+    return catalog_responses.store(validators, PRODUCT_RESPONSE, product)
 
 
 @router.put("/{product_id}", response_model=ProductResponse)
@@ -201,6 +434,7 @@ async def update_product(
     
     await db.commit()
     await db.refresh(product)
+    await catalog_versions.bump(tenant.id)
     
     return product
 
@@ -237,6 +471,7 @@ async def delete_product(
     
     await db.delete(product)
     await db.commit()
+    await catalog_versions.bump(tenant.id)
     
     return None
 
@@ -2,14 +2,21 @@ from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List
+from pydantic import TypeAdapter
 from app.core.database import get_db
 from app.schemas.shipping import ShippingClassCreate, ShippingClassUpdate, ShippingClassResponse
 from app.models.shipping import ShippingClass
 from app.api.v1.tenants import get_current_user_id
 from app.api.v1.products import get_tenant_from_request
+from app.services.shipping_cache import shipping_cache
+from app.services.catalog import catalog_versions, catalog_validators, catalog_responses
 
 router = APIRouter()
 
+# Serializers for cached storefront responses
+SHIPPING_CLASS_RESPONSE = TypeAdapter(ShippingClassResponse)
+SHIPPING_CLASS_LIST_RESPONSE = TypeAdapter(List[ShippingClassResponse])
+
 
 @router.post("", response_model=ShippingClassResponse, status_code=status.HTTP_201_CREATED)
 async def create_shipping_class(
@@ -35,6 +42,8 @@ async def create_shipping_class(
     db.add(shipping_class)
     await db.commit()
     await db.refresh(shipping_class)
+    await shipping_cache.invalidate(tenant.id)
+    await catalog_versions.bump(tenant.id)
     
     return shipping_class
 
@@ -54,17 +63,20 @@ async def list_shipping_classes(
             detail="Tenant context required"
         )
     
-    query = select(ShippingClass).where(ShippingClass.tenant_id == tenant.id)
-    
-    if active_only:
-        query = query.where(ShippingClass.is_active == True)
+    validators = await catalog_validators(request, tenant.id, active_only=active_only)
+    if validators.not_modified:
+        return validators.not_modified_response()
+    cached = catalog_responses.get(validators)
+    if cached is not None:
+        return cached
     
-    query = query.order_by(ShippingClass.sort_order, ShippingClass.name)
+    # Cached per tenant in display order; no query on a hit
+    shipping_classes = await shipping_cache.get(tenant.id, db)
     
-    result = await db.execute(query)
-    shipping_classes = result.scalars().all()
+    if active_only:
+        shipping_classes = [shipping_class for shipping_class in shipping_classes if shipping_class.is_active]
     
-    return shipping_classes
+    return catalog_responses.store(validators, SHIPPING_CLASS_LIST_RESPONSE, list(shipping_classes))
 
 
 @router.get("/{shipping_id}", response_model=ShippingClassResponse)
@@ -82,6 +94,13 @@ async def get_shipping_class(
             detail="Tenant context required"
         )
     
+    validators = await catalog_validators(request, tenant.id, shipping_id=shipping_id)
+    if validators.not_modified:
+        return validators.not_modified_response()
+    cached = catalog_responses.get(validators)
+    if cached is not None:
+        return cached
+    
     result = await db.execute(
         select(ShippingClass).where(
             ShippingClass.id == shipping_id,
@@ -96,7 +115,7 @@ async def get_shipping_class(
             detail="Shipping class not found"
         )
     
-    return shipping_class
+    return catalog_responses.store(validators, SHIPPING_CLASS_RESPONSE, shipping_class)
 
 
 @router.put("/{shipping_id}", response_model=ShippingClassResponse)
@@ -137,6 +156,8 @@ async def update_shipping_class(
     
     await db.commit()
     await db.refresh(shipping_class)
+    await shipping_cache.invalidate(tenant.id)
+    await catalog_versions.bump(tenant.id)
     
     return shipping_class
 
@@ -173,6 +194,8 @@ async def delete_shipping_class(
     
     await db.delete(shipping_class)
     await db.commit()
+    await shipping_cache.invalidate(tenant.id)
+    await catalog_versions.bump(tenant.id)
     
     return None
 
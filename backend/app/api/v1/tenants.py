@@ -1,22 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List
+from pydantic import TypeAdapter
 from app.core.database import get_db
 from app.schemas.tenant import TenantCreate, TenantUpdate, TenantResponse
 from app.models.tenant import Tenant
 from app.models.user import User
 from app.core.security import decode_access_token
+from app.services.tenant_cache import tenant_cache
+from app.services.catalog import catalog_versions, catalog_validators, catalog_responses
 from fastapi import Header
 
 router = APIRouter()
 
+# Serializer for cached store lookups by slug
+TENANT_RESPONSE = TypeAdapter(TenantResponse)
+
 
 async def get_current_user_id(
-    authorization: str = Header(None),
-    db: AsyncSession = Depends(get_db)
+    authorization: str = Header(None)
 ):
-    """Extract user ID from JWT token"""
+    """Extract user ID from JWT token (no database access)"""
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -71,6 +76,10 @@ async def create_tenant(
     await db.commit()
     await db.refresh(tenant)
     
+    # Make the new store resolvable in every worker
+    await tenant_cache.invalidate(tenant.slug, tenant.is_active)
+    await catalog_versions.bump(tenant.id)
+    
     return tenant
 
 
@@ -141,15 +150,31 @@ async def update_tenant(
     await db.commit()
     await db.refresh(tenant)
     
+    # Drop the cached copy in every worker
+    await tenant_cache.invalidate(tenant.slug, tenant.is_active)
+    await catalog_versions.bump(tenant.id)
+    
     return tenant
 
 
 @router.get("/slug/{slug}", response_model=TenantResponse)
 async def get_tenant_by_slug(
     slug: str,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     """Get tenant by slug (public endpoint for store pages)"""
+    # The tenant cache knows the id (and whether the store exists) without a query
+    cached = await tenant_cache.get_by_slug(slug)
+    validators = None
+    if cached:
+        validators = await catalog_validators(request, cached.id, slug=slug)
+        if validators.not_modified:
+            return validators.not_modified_response()
+        cached_response = catalog_responses.get(validators)
+        if cached_response is not None:
+            return cached_response
+    
     result = await db.execute(
         select(Tenant).where(
             Tenant.slug == slug,
@@ -164,5 +189,7 @@ async def get_tenant_by_slug(
             detail="Store not found"
         )
     
-    return tenant
+    if validators is None or validators.tenant_id != tenant.id:
+        validators = await catalog_validators(request, tenant.id, slug=slug)
+    return catalog_responses.store(validators, TENANT_RESPONSE, tenant)
 
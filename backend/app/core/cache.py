@@ -0,0 +1,214 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+from app.core.redis import get_redis
+import asyncio
+import json
+import logging
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Sentinel for cache misses, so that None can be cached as a value
+MISSING = object()
+
+_stats_providers: Dict[str, Callable[[], dict]] = {}
+
+
+def register_stats(name: str, provider: Callable[[], dict]):
+    """Expose a stats callable on the health stats endpoint"""
+    _stats_providers[name] = provider
+
+
+def collect_stats() -> dict:
+    """Stats for every cache and counter registered in this process"""
+    return {name: provider() for name, provider in _stats_providers.items()}
+
+
+class TTLCache:
+    """
+    Bounded in-process cache with per-entry expiry and LRU eviction.
+
+    With maxbytes set, values must be bytes and their total length is kept
+    under it as well as the entry count under maxsize.
+
+    Not thread-safe; it is meant to be used from the event loop only.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float, maxbytes: Optional[int] = None):
+        self.name = name
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.ttl = ttl
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+        register_stats(name, self.stats)
+
+    def get(self, key, default=MISSING):
+        """Get a value, counting the lookup as a hit or a miss"""
+        entry = self._data.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        """Store a value, evicting the least recently used entries if full"""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        if self.maxbytes is not None and len(value) > self.maxbytes:
+            return
+
+        self._remove(key)
+        self._data[key] = (time.monotonic() + ttl, value)
+        if self.maxbytes is not None:
+            self.bytes += len(value)
+
+        while len(self._data) > self.maxsize or (self.maxbytes is not None and self.bytes > self.maxbytes):
+            self._remove(next(iter(self._data)))
+            self.evictions += 1
+
+    def delete(self, key):
+        """Remove a single entry"""
+        self._remove(key)
+
+    def clear(self):
+        """Remove all entries"""
+        self._data.clear()
+        self.bytes = 0
+
+    def _remove(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None and self.maxbytes is not None:
+            self.bytes -= len(entry[1])
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Hit/miss counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            **({"bytes": self.bytes, "maxbytes": self.maxbytes} if self.maxbytes is not None else {}),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class InvalidationBus:
+    """
+    Broadcasts cache invalidations to every worker process.
+
+    Handlers run locally right away and the event is published on a Redis
+    channel for the other uvicorn workers. Without Redis only the local
+    handlers run, which is all a single-process deployment needs.
+
+    A handler receives the invalidated key, or None meaning "drop everything"
+    (sent after the Redis subscription had to be re-established and events
+    may have been missed).
+    """
+
+    CHANNEL = "bdtenant:invalidate"
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Callable[[Any], None]]] = {}
+        self._origin = uuid.uuid4().hex
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, topic: str, handler: Callable[[Any], None]):
+        """Register a local handler for a topic"""
+        self._handlers.setdefault(topic, []).append(handler)
+
+    async def publish(self, topic: str, key: Any):
+        """Invalidate a key locally and in every other worker"""
+        self._dispatch(topic, key)
+
+        redis = get_redis()
+        if redis is None:
+            return
+
+        try:
+            await redis.publish(
+                self.CHANNEL,
+                json.dumps({"origin": self._origin, "topic": topic, "key": key})
+            )
+        except Exception as e:
+            logger.warning(f"Failed to broadcast {topic} invalidation: {e}")
+
+    def _dispatch(self, topic: str, key: Any):
+        for handler in self._handlers.get(topic, []):
+            try:
+                handler(key)
+            except Exception as e:
+                logger.error(f"Invalidation handler for {topic} failed: {e}")
+
+    async def start(self):
+        """Start listening for invalidations from other workers"""
+        if get_redis() is not None and self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        """Stop the listener task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _listen(self):
+        reconnecting = False
+
+        while True:
+            pubsub = get_redis().pubsub()
+            try:
+                await pubsub.subscribe(self.CHANNEL)
+
+                if reconnecting:
+                    # Events may have been lost while disconnected
+                    for topic in self._handlers:
+                        self._dispatch(topic, None)
+                    reconnecting = False
+
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+
+                    event = json.loads(message["data"])
+                    if event.get("origin") == self._origin:
+                        continue
+
+                    self._dispatch(event["topic"], event.get("key"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Invalidation listener error: {e}, reconnecting")
+                reconnecting = True
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+invalidation_bus = InvalidationBus()
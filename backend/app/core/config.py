@@ -19,6 +19,14 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     # JWT_EXPIRATION_HOURS can be empty string, handle it
     JWT_EXPIRATION_HOURS: str = "24"
+    # Verified token claims kept per worker until the token expires
+    JWT_CACHE_MAX_SIZE: str = "10000"
+    # User status (exists / is_active) cached per worker for authentication
+    USER_STATUS_CACHE_TTL_SECONDS: str = "30"
+    USER_STATUS_CACHE_MAX_SIZE: str = "10000"
+    # bcrypt runs on a dedicated pool; requests beyond the backlog get a 503
+    PASSWORD_HASH_WORKERS: str = "2"
+    PASSWORD_HASH_MAX_PENDING: str = "32"
     
     # CORS - Can be comma-separated string or list
     CORS_ORIGINS: Union[str, List[str]] = "http://localhost:5173,http://localhost:3000"
@@ -44,12 +52,56 @@ class Settings(BaseSettings):
     OTP_PROVIDER: str = "local"
     OTP_API_KEY: str = ""
     OTP_API_URL: str = ""
+    OTP_TTL_SECONDS: str = "300"
+    OTP_RESEND_COOLDOWN_SECONDS: str = "60"
+    OTP_MAX_ATTEMPTS: str = "5"
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     
+    # Tenant resolution cache
+    TENANT_CACHE_TTL_SECONDS: str = "300"
+    TENANT_CACHE_MAX_SIZE: str = "10000"
+    TENANT_NEGATIVE_CACHE_TTL_SECONDS: str = "30"
+    TENANT_SLUG_REFRESH_SECONDS: str = "60"
+    
+    # Shipping class cache
+    SHIPPING_CACHE_TTL_SECONDS: str = "300"
+    SHIPPING_CACHE_MAX_SIZE: str = "10000"
+    
+    # Storefront catalog versions (ETags, response cache)
+    CATALOG_VERSION_TTL_SECONDS: str = "60"
+    CATALOG_VERSION_CACHE_MAX_SIZE: str = "10000"
+    # Sent with storefront reads; "no-cache" makes clients revalidate (cheap 304s)
+    STOREFRONT_CACHE_CONTROL: str = "public, no-cache"
+    # Serialized storefront responses kept per worker
+    CATALOG_RESPONSE_CACHE_TTL_SECONDS: str = "300"
+    CATALOG_RESPONSE_CACHE_MAX_SIZE: str = "5000"
+    CATALOG_RESPONSE_CACHE_MAX_BYTES: str = "1048576"  # larger bodies are not cached
+    CATALOG_RESPONSE_CACHE_MAX_TOTAL_BYTES: str = "67108864"  # all cached bodies, per worker
+    
+    # Order numbers: "snowflake" (time-ordered, unique per worker id) or "random"
+    ORDER_NUMBER_STRATEGY: str = "snowflake"
+    # Leave empty to lease a worker id from Redis (or derive it from the process id)
+    ORDER_NUMBER_WORKER_ID: str = ""
+    
+    # Idempotency-Key on order creation
+    IDEMPOTENCY_TTL_SECONDS: str = "86400"
+    # How long a key stays claimed by a request that is still running
+    IDEMPOTENCY_LOCK_SECONDS: str = "30"
+    # How long a duplicate waits for the in-flight request before giving up
+    IDEMPOTENCY_WAIT_SECONDS: str = "10"
+    
+    # Outbox worker (python -m app.workers.outbox)
+    OUTBOX_POLL_SECONDS: str = "1"
+    OUTBOX_BATCH_SIZE: str = "50"
+    # Concurrent sends per channel (email, whatsapp, facebook_pixel)
+    OUTBOX_CHANNEL_CONCURRENCY: str = "5"
+    OUTBOX_MAX_ATTEMPTS: str = "8"
+    
     # File Upload
     MAX_UPLOAD_SIZE: str = "10485760"  # 10MB - handle as string, convert later
+    PRODUCT_IMPORT_MAX_ROWS: str = "20000"  # rows per product import file
     UPLOAD_DIR: str = "uploads"
     
     # Environment
@@ -74,9 +126,37 @@ if not settings.POSTGRES_USER or not settings.POSTGRES_USER.strip() or settings.
 # Convert string values to proper types
 settings.POSTGRES_PORT = int(settings.POSTGRES_PORT) if settings.POSTGRES_PORT and settings.POSTGRES_PORT.strip() else 5432
 settings.JWT_EXPIRATION_HOURS = int(settings.JWT_EXPIRATION_HOURS) if settings.JWT_EXPIRATION_HOURS and settings.JWT_EXPIRATION_HOURS.strip() else 24
+settings.JWT_CACHE_MAX_SIZE = int(settings.JWT_CACHE_MAX_SIZE) if settings.JWT_CACHE_MAX_SIZE and str(settings.JWT_CACHE_MAX_SIZE).strip() else 10000
+settings.USER_STATUS_CACHE_TTL_SECONDS = int(settings.USER_STATUS_CACHE_TTL_SECONDS) if settings.USER_STATUS_CACHE_TTL_SECONDS and str(settings.USER_STATUS_CACHE_TTL_SECONDS).strip() else 30
+settings.USER_STATUS_CACHE_MAX_SIZE = int(settings.USER_STATUS_CACHE_MAX_SIZE) if settings.USER_STATUS_CACHE_MAX_SIZE and str(settings.USER_STATUS_CACHE_MAX_SIZE).strip() else 10000
+settings.PASSWORD_HASH_WORKERS = int(settings.PASSWORD_HASH_WORKERS) if settings.PASSWORD_HASH_WORKERS and str(settings.PASSWORD_HASH_WORKERS).strip() else 2
+settings.PASSWORD_HASH_MAX_PENDING = int(settings.PASSWORD_HASH_MAX_PENDING) if settings.PASSWORD_HASH_MAX_PENDING and str(settings.PASSWORD_HASH_MAX_PENDING).strip() else 32
+settings.OTP_TTL_SECONDS = int(settings.OTP_TTL_SECONDS) if settings.OTP_TTL_SECONDS and str(settings.OTP_TTL_SECONDS).strip() else 300
+settings.OTP_RESEND_COOLDOWN_SECONDS = int(settings.OTP_RESEND_COOLDOWN_SECONDS) if settings.OTP_RESEND_COOLDOWN_SECONDS and str(settings.OTP_RESEND_COOLDOWN_SECONDS).strip() else 60
+settings.OTP_MAX_ATTEMPTS = int(settings.OTP_MAX_ATTEMPTS) if settings.OTP_MAX_ATTEMPTS and str(settings.OTP_MAX_ATTEMPTS).strip() else 5
+settings.IDEMPOTENCY_TTL_SECONDS = int(settings.IDEMPOTENCY_TTL_SECONDS) if settings.IDEMPOTENCY_TTL_SECONDS and str(settings.IDEMPOTENCY_TTL_SECONDS).strip() else 86400
+settings.IDEMPOTENCY_LOCK_SECONDS = int(settings.IDEMPOTENCY_LOCK_SECONDS) if settings.IDEMPOTENCY_LOCK_SECONDS and str(settings.IDEMPOTENCY_LOCK_SECONDS).strip() else 30
+settings.IDEMPOTENCY_WAIT_SECONDS = int(settings.IDEMPOTENCY_WAIT_SECONDS) if settings.IDEMPOTENCY_WAIT_SECONDS and str(settings.IDEMPOTENCY_WAIT_SECONDS).strip() else 10
+settings.OUTBOX_POLL_SECONDS = float(settings.OUTBOX_POLL_SECONDS) if settings.OUTBOX_POLL_SECONDS and str(settings.OUTBOX_POLL_SECONDS).strip() else 1.0
+settings.OUTBOX_BATCH_SIZE = int(settings.OUTBOX_BATCH_SIZE) if settings.OUTBOX_BATCH_SIZE and str(settings.OUTBOX_BATCH_SIZE).strip() else 50
+settings.OUTBOX_CHANNEL_CONCURRENCY = int(settings.OUTBOX_CHANNEL_CONCURRENCY) if settings.OUTBOX_CHANNEL_CONCURRENCY and str(settings.OUTBOX_CHANNEL_CONCURRENCY).strip() else 5
+settings.OUTBOX_MAX_ATTEMPTS = int(settings.OUTBOX_MAX_ATTEMPTS) if settings.OUTBOX_MAX_ATTEMPTS and str(settings.OUTBOX_MAX_ATTEMPTS).strip() else 8
+settings.SHIPPING_CACHE_TTL_SECONDS = int(settings.SHIPPING_CACHE_TTL_SECONDS) if settings.SHIPPING_CACHE_TTL_SECONDS and str(settings.SHIPPING_CACHE_TTL_SECONDS).strip() else 300
+settings.SHIPPING_CACHE_MAX_SIZE = int(settings.SHIPPING_CACHE_MAX_SIZE) if settings.SHIPPING_CACHE_MAX_SIZE and str(settings.SHIPPING_CACHE_MAX_SIZE).strip() else 10000
+settings.CATALOG_VERSION_TTL_SECONDS = int(settings.CATALOG_VERSION_TTL_SECONDS) if settings.CATALOG_VERSION_TTL_SECONDS and str(settings.CATALOG_VERSION_TTL_SECONDS).strip() else 60
+settings.CATALOG_VERSION_CACHE_MAX_SIZE = int(settings.CATALOG_VERSION_CACHE_MAX_SIZE) if settings.CATALOG_VERSION_CACHE_MAX_SIZE and str(settings.CATALOG_VERSION_CACHE_MAX_SIZE).strip() else 10000
+settings.CATALOG_RESPONSE_CACHE_TTL_SECONDS = int(settings.CATALOG_RESPONSE_CACHE_TTL_SECONDS) if settings.CATALOG_RESPONSE_CACHE_TTL_SECONDS and str(settings.CATALOG_RESPONSE_CACHE_TTL_SECONDS).strip() else 300
+settings.CATALOG_RESPONSE_CACHE_MAX_SIZE = int(settings.CATALOG_RESPONSE_CACHE_MAX_SIZE) if settings.CATALOG_RESPONSE_CACHE_MAX_SIZE and str(settings.CATALOG_RESPONSE_CACHE_MAX_SIZE).strip() else 5000
+settings.CATALOG_RESPONSE_CACHE_MAX_BYTES = int(settings.CATALOG_RESPONSE_CACHE_MAX_BYTES) if settings.CATALOG_RESPONSE_CACHE_MAX_BYTES and str(settings.CATALOG_RESPONSE_CACHE_MAX_BYTES).strip() else 1048576
+settings.CATALOG_RESPONSE_CACHE_MAX_TOTAL_BYTES = int(settings.CATALOG_RESPONSE_CACHE_MAX_TOTAL_BYTES) if settings.CATALOG_RESPONSE_CACHE_MAX_TOTAL_BYTES and str(settings.CATALOG_RESPONSE_CACHE_MAX_TOTAL_BYTES).strip() else 67108864
 settings.MAX_UPLOAD_SIZE = int(settings.MAX_UPLOAD_SIZE) if settings.MAX_UPLOAD_SIZE and settings.MAX_UPLOAD_SIZE.strip() else 10485760
+settings.PRODUCT_IMPORT_MAX_ROWS = int(settings.PRODUCT_IMPORT_MAX_ROWS) if settings.PRODUCT_IMPORT_MAX_ROWS and str(settings.PRODUCT_IMPORT_MAX_ROWS).strip() else 20000
 settings.DEBUG = settings.DEBUG.lower() in ("true", "1", "yes") if isinstance(settings.DEBUG, str) else bool(settings.DEBUG)
 settings.SMTP_PORT = int(settings.SMTP_PORT) if settings.SMTP_PORT and str(settings.SMTP_PORT).strip() else 587
+settings.TENANT_CACHE_TTL_SECONDS = int(settings.TENANT_CACHE_TTL_SECONDS) if settings.TENANT_CACHE_TTL_SECONDS and str(settings.TENANT_CACHE_TTL_SECONDS).strip() else 300
+settings.TENANT_CACHE_MAX_SIZE = int(settings.TENANT_CACHE_MAX_SIZE) if settings.TENANT_CACHE_MAX_SIZE and str(settings.TENANT_CACHE_MAX_SIZE).strip() else 10000
+settings.TENANT_NEGATIVE_CACHE_TTL_SECONDS = int(settings.TENANT_NEGATIVE_CACHE_TTL_SECONDS) if settings.TENANT_NEGATIVE_CACHE_TTL_SECONDS and str(settings.TENANT_NEGATIVE_CACHE_TTL_SECONDS).strip() else 30
+settings.TENANT_SLUG_REFRESH_SECONDS = int(settings.TENANT_SLUG_REFRESH_SECONDS) if settings.TENANT_SLUG_REFRESH_SECONDS and str(settings.TENANT_SLUG_REFRESH_SECONDS).strip() else 60
 
 # Construct DATABASE_URL if not provided
 if not settings.DATABASE_URL:
@@ -1,8 +1,13 @@
+from contextlib import asynccontextmanager
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from sqlalchemy import event
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.pool import NullPool
 from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Convert postgresql:// to postgresql+asyncpg:// for async support
 # Handle both postgresql:// and postgresql+asyncpg:// formats
@@ -14,13 +19,16 @@ elif not settings.DATABASE_URL.startswith("postgresql+asyncpg://"):
 else:
     database_url = settings.DATABASE_URL
 
+# Tests get a fresh connection per session; NullPool takes no sizing arguments
+if settings.ENVIRONMENT == "test":
+    pool_options = {"poolclass": NullPool}
+else:
+    pool_options = {"pool_pre_ping": True, "pool_size": 10, "max_overflow": 20}
+
 engine = create_async_engine(
     database_url,
     echo=settings.DEBUG,
-    poolclass=NullPool if settings.ENVIRONMENT == "test" else None,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    **pool_options,
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -34,11 +42,105 @@ AsyncSessionLocal = async_sessionmaker(
 Base = declarative_base()
 
 
+# Postgres deadlock_detected and serialization_failure: the transaction lost
+# a race for locks and can simply be tried again
+LOCK_CONFLICT_SQLSTATES = {"40P01", "40001"}
+
+
+def is_lock_conflict(error: DBAPIError) -> bool:
+    """Whether a database error means the transaction lost a lock race"""
+    return getattr(error.orig, "sqlstate", None) in LOCK_CONFLICT_SQLSTATES
+
+
 async def get_db():
-    """Dependency for getting database session"""
+    """
+    Dependency for getting database session.
+    
+    The session is lazy: it only checks a connection out of the pool when
+    the first statement runs, and gives it back on commit/rollback or when
+    the request finishes. Requests that are rejected early (auth, missing
+    tenant) or answered from a cache never hold a pooled connection, so
+    only depend on this where the handler actually queries. Dependencies
+    that just parse the request or token must not depend on it.
+    """
     async with AsyncSessionLocal() as session:
+        yield session
+
+
+@asynccontextmanager
+async def index_build_connection():
+    """
+    AUTOCOMMIT connection for CREATE INDEX CONCURRENTLY, or None.
+    
+    Holds an advisory lock, so one worker builds indexes while the others
+    start up; those get None and skip building.
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        
+        result = await conn.execute(text("SELECT pg_try_advisory_lock(hashtext('create_concurrent_indexes'))"))
+        if not result.scalar():
+            logger.info("Another worker is creating indexes")
+            yield None
+            return
+        
         try:
-            yield session
+            yield conn
         finally:
-            await session.close()
+            await conn.execute(text("SELECT pg_advisory_unlock(hashtext('create_concurrent_indexes'))"))
+
+
+async def create_index_concurrently(conn, name: str, definition: str):
+    """
+    Build an index unless a valid one exists, e.g. definition="ON products (slug)".
+    
+    Run on a connection from index_build_connection(): while its lock is
+    held, an index that is still invalid can only be left over from an
+    interrupted build, so it is dropped and built again (IF NOT EXISTS
+    alone would keep the invalid one forever).
+    """
+    result = await conn.execute(
+        text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+        {"name": name}
+    )
+    valid = result.scalar()
+    if valid:
+        return
+    if valid is False:
+        await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    
+    logger.info(f"Creating index {name}")
+    await conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}"))
+
 
+async def create_concurrent_indexes():
+    """
+    Create indexes added to tables that already hold data; safe to run on every start.
+    
+    create_all() only creates missing tables (with their indexes), so an
+    index added to an existing table is marked with
+    info={"create_concurrently": True} and built here instead: CONCURRENTLY
+    and outside any transaction, so the table stays writable meanwhile.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+    
+    indexes = [
+        index
+        for table in Base.metadata.sorted_tables
+        for index in table.indexes
+        if index.info.get("create_concurrently")
+    ]
+    if not indexes:
+        return
+    
+    async with index_build_connection() as conn:
+        if conn is None:
+            return
+        
+        for index in indexes:
+            columns = ", ".join(column.name for column in index.columns)
+            try:
+                await create_index_concurrently(conn, index.name, f"ON {index.table.name} ({columns})")
+            except Exception as e:
+                logger.warning(f"Failed to create index {index.name}: {e}")
@@ -0,0 +1,27 @@
+from fastapi import HTTPException, status
+from typing import Any, List
+import base64
+import json
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Pack the sort key of the last row of a page into an opaque cursor"""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Unpack a cursor made by encode_cursor; rejects anything malformed with 400"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        values = None
+    
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    
+    return values
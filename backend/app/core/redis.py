@@ -0,0 +1,48 @@
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Redis is optional: the base version ships without the client library and
+# single-node deployments may not run a Redis server at all.
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+_client = None
+
+
+async def init_redis():
+    """Connect to Redis if it is installed and reachable"""
+    global _client
+
+    if aioredis is None or not settings.REDIS_URL:
+        logger.info("Redis not configured, using in-process fallbacks")
+        return None
+
+    client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+    try:
+        await client.ping()
+    except Exception as e:
+        logger.warning(f"Redis unavailable ({e}), using in-process fallbacks")
+        await client.aclose()
+        return None
+
+    _client = client
+    logger.info("Redis connection successful")
+    return _client
+
+
+def get_redis():
+    """Get the shared Redis client, or None when running without Redis"""
+    return _client
+
+
+async def close_redis():
+    """Close the shared Redis client"""
+    global _client
+
+    if _client is not None:
+        await _client.aclose()
+        _client = None
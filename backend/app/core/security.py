@@ -3,9 +3,21 @@ from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.cache import TTLCache, MISSING, register_stats
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
+import time
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Verified claims keyed by token digest; each entry lives until the token's exp
+_claims_cache = TTLCache(
+    "jwt_claims",
+    maxsize=settings.JWT_CACHE_MAX_SIZE,
+    ttl=settings.JWT_EXPIRATION_HOURS * 3600,
+)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
@@ -17,6 +29,85 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHashingBusy(Exception):
+    """Raised when the password hashing backlog is full"""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a small dedicated thread pool.
+
+    bcrypt releases the GIL, so hashing off the event loop keeps a login
+    burst from stalling every other request on the worker. At most
+    max_pending calls may be running or queued; beyond that callers get
+    PasswordHashingBusy straight away instead of waiting in line.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+        register_stats("password_hashing", self.stats)
+
+    async def run(self, func, *args):
+        """Run a hashing function on the pool"""
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHashingBusy()
+
+        self._pending += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+            elapsed = time.perf_counter() - started
+            self.completed += 1
+            self._total_seconds += elapsed
+            self._max_seconds = max(self._max_seconds, elapsed)
+
+    def shutdown(self):
+        """Stop the worker threads"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        """Queue depth and latency (including queueing) for monitoring"""
+        return {
+            "workers": self.workers,
+            "pending": self._pending,
+            "queued": max(0, self._pending - self.workers),
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_ms": round(self._total_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+            "max_ms": round(self._max_seconds * 1000, 2),
+        }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password off the event loop (raises PasswordHashingBusy)"""
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password off the event loop (raises PasswordHashingBusy)"""
+    return await password_hasher.run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -33,12 +124,23 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 def decode_access_token(token: str) -> Optional[dict]:
-    """Decode and verify JWT token"""
+    """Decode and verify JWT token, reusing claims verified earlier"""
+    key = hashlib.sha256(token.encode()).digest()
+    
+    payload = _claims_cache.get(key)
+    if payload is not MISSING:
+        return dict(payload)
+    
     try:
         payload = jwt.decode(
             token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
         )
-        return payload
     except JWTError:
         return None
+    
+    exp = payload.get("exp")
+    ttl = exp - time.time() if isinstance(exp, (int, float)) else None
+    _claims_cache.set(key, payload, ttl=ttl)
+    
+    return dict(payload)
 
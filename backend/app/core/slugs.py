@@ -0,0 +1,7 @@
+import re
+
+
+def slugify(text: str) -> str:
+    """Lowercase ASCII slug of a title; empty for titles with no Latin letters or digits"""
+    slug = re.sub(r'[^a-z0-9]+', '-', text.lower())
+    return re.sub(r'^-+|-+$', '', slug)
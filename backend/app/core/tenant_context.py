@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+from typing import Optional
+from app.models.tenant import Tenant
+
+
+@dataclass(frozen=True, slots=True)
+class TenantContext:
+    """
+    Immutable snapshot of the tenant fields request handlers need.
+
+    The middleware puts one of these on request.state.tenant instead of an
+    ORM instance: it is shared across requests through the tenant cache and
+    handed to background tasks, so it must never lazy-load or hold on to a
+    session.
+    """
+
+    id: int
+    slug: str
+    owner_id: int
+    currency: str
+    enable_cod: bool
+    email_notifications: bool
+    notification_email: Optional[str]
+    whatsapp_notifications: bool
+    notification_whatsapp: Optional[str]
+    enable_facebook_pixel: bool
+    facebook_pixel_id: Optional[str]
+    facebook_access_token: Optional[str]
+
+    @classmethod
+    def from_model(cls, tenant: Tenant) -> "TenantContext":
+        """Snapshot a loaded Tenant row"""
+        return cls(
+            id=tenant.id,
+            slug=tenant.slug,
+            owner_id=tenant.owner_id,
+            currency=tenant.currency,
+            enable_cod=tenant.enable_cod,
+            email_notifications=tenant.email_notifications,
+            notification_email=tenant.notification_email,
+            whatsapp_notifications=tenant.whatsapp_notifications,
+            notification_whatsapp=tenant.notification_whatsapp,
+            enable_facebook_pixel=tenant.enable_facebook_pixel,
+            facebook_pixel_id=tenant.facebook_pixel_id,
+            facebook_access_token=tenant.facebook_access_token,
+        )
@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from app.models.user import User
+
+
+@dataclass(frozen=True, slots=True)
+class UserContext:
+    """Immutable snapshot of the authenticated user, safe to cache across requests"""
+
+    id: int
+    uuid: str
+    is_active: bool
+    is_superuser: bool
+
+    @classmethod
+    def from_model(cls, user: User) -> "UserContext":
+        """Snapshot a loaded User row"""
+        return cls(
+            id=user.id,
+            uuid=str(user.uuid),
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+        )
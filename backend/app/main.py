@@ -1,13 +1,20 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
 import logging
 
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import engine, Base, create_concurrent_indexes
+from app.core.redis import init_redis, close_redis
+from app.core.cache import invalidation_bus, collect_stats
+from app.core.security import password_hasher
 from app.middleware.tenant import TenantMiddleware
+from app.services.tenant_cache import tenant_cache
+from app.services.order_number import order_number_generator
+from app.services.product_search import create_search_indexes
 from app.api.v1 import api_router
+from app.api.dependencies import get_superuser
 
 logger = logging.getLogger(__name__)
 
@@ -46,9 +53,22 @@ async def lifespan(app: FastAPI):
                 logger.error("4. If database already exists, password must match the original password")
                 raise
     
+    await create_concurrent_indexes()
+    await create_search_indexes()
+    
+    # Redis is optional; caches fall back to per-process invalidation
+    await init_redis()
+    await invalidation_bus.start()
+    await tenant_cache.start()
+    await order_number_generator.start()
+    
     yield
     # Shutdown: Cleanup if needed
-    pass
+    await order_number_generator.stop()
+    await tenant_cache.stop()
+    await invalidation_bus.stop()
+    await close_redis()
+    password_hasher.shutdown()
 
 
 app = FastAPI(
@@ -100,3 +120,8 @@ async def api_health_check():
     """API health check endpoint"""
     return {"status": "healthy", "service": "bd-tenant-backend"}
 
+
+@app.get("/api/v1/health/stats", dependencies=[Depends(get_superuser)])
+async def api_health_stats():
+    """Per-worker cache and password hashing statistics (superusers only)"""
+    return collect_stats()
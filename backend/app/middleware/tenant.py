@@ -1,44 +1,53 @@
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
-from app.models.tenant import Tenant
-from app.core.database import AsyncSessionLocal
-from sqlalchemy import select
-import re
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.services.tenant_cache import tenant_cache
 
 
-class TenantMiddleware(BaseHTTPMiddleware):
+class TenantMiddleware:
     """
     Multi-tenant middleware that extracts tenant from subdomain.
-    
+
     Example:
     - app.mysaas.com -> main app (no tenant)
     - storename.mysaas.com -> tenant: storename
+
+    Implemented as plain ASGI middleware: it only resolves the tenant before
+    handing the request on and never wraps the response, so streaming
+    responses and background tasks pass through untouched.
     """
-    
-    async def dispatch(self, request: Request, call_next):
-        host = request.headers.get("host", "")
-        
-        # Extract subdomain from host
-        # Format: subdomain.domain.com or subdomain.domain.com:port
-        host_parts = host.split(":")
-        hostname = host_parts[0]
-        
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        path = scope["path"]
+
         # Skip tenant resolution for:
         # - API health checks
         # - Static files
-        # - Main app domain (no subdomain)
         if (
-            request.url.path.startswith("/health") or
-            request.url.path.startswith("/static") or
-            request.url.path.startswith("/api/v1/health")
+            path.startswith("/health") or
+            path.startswith("/static") or
+            path.startswith("/api/v1/health")
         ):
-            return await call_next(request)
-        
+            return await self.app(scope, receive, send)
+
+        # Extract subdomain from host
+        # Format: subdomain.domain.com or subdomain.domain.com:port
+        host = ""
+        for name, value in scope["headers"]:
+            if name == b"host":
+                host = value.decode("latin-1")
+                break
+        hostname = host.split(":")[0]
+
         # Extract subdomain
         parts = hostname.split(".")
         tenant_slug = None
-        
+
         # If we have more than 2 parts, assume first is subdomain
         # e.g., storename.mysaas.com -> storename
         if len(parts) >= 3:
@@ -46,32 +55,24 @@ class TenantMiddleware(BaseHTTPMiddleware):
             # Skip common subdomains that aren't tenants
             if tenant_slug in ["www", "api", "app", "admin"]:
                 tenant_slug = None
-        
-        # Resolve tenant from database
+
+        # Resolve tenant (cached per worker, database only on a miss)
         tenant = None
         if tenant_slug:
-            async with AsyncSessionLocal() as session:
-                result = await session.execute(
-                    select(Tenant).where(
-                        Tenant.slug == tenant_slug,
-                        Tenant.is_active == True
+            tenant = await tenant_cache.get_by_slug(tenant_slug)
+
+            if not tenant:
+                # Tenant not found - return 404 for store pages
+                if not path.startswith("/api"):
+                    response = JSONResponse(
+                        status_code=404,
+                        content={"detail": "Store not found"}
                     )
-                )
-                tenant = result.scalar_one_or_none()
-                
-                if not tenant:
-                    # Tenant not found - return 404 for store pages
-                    if not request.url.path.startswith("/api"):
-                        from fastapi.responses import JSONResponse
-                        return JSONResponse(
-                            status_code=404,
-                            content={"detail": "Store not found"}
-                        )
-        
-        # Store tenant in request state
-        request.state.tenant = tenant
-        request.state.tenant_slug = tenant_slug
-        
-        response = await call_next(request)
-        return response
+                    return await response(scope, receive, send)
+
+        # Store tenant in request state (read back as request.state.tenant)
+        state = scope.setdefault("state", {})
+        state["tenant"] = tenant
+        state["tenant_slug"] = tenant_slug
 
+        await self.app(scope, receive, send)
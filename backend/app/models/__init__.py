@@ -3,6 +3,7 @@ from app.models.tenant import Tenant
 from app.models.product import Product
 from app.models.order import Order, OrderItem
 from app.models.shipping import ShippingClass
+from app.models.outbox import OutboxEvent, OutboxStatus
 
 __all__ = [
     "User",
@@ -11,5 +12,7 @@ __all__ = [
     "Order",
     "OrderItem",
     "ShippingClass",
+    "OutboxEvent",
+    "OutboxStatus",
 ]
 
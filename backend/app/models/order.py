@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Numeric, Enum as SQLEnum
+from sqlalchemy import Index, Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Numeric, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -14,8 +14,28 @@ class OrderStatus(str, enum.Enum):
     CANCELLED = "cancelled"  # বাতিল
 
 
+# Status changes allowed by bulk updates; delivered and cancelled are final
+ORDER_STATUS_TRANSITIONS = {
+    OrderStatus.PENDING: {OrderStatus.CONFIRMED, OrderStatus.CANCELLED},
+    OrderStatus.CONFIRMED: {OrderStatus.SHIPPED, OrderStatus.CANCELLED},
+    OrderStatus.SHIPPED: {OrderStatus.DELIVERED, OrderStatus.CANCELLED},
+    OrderStatus.DELIVERED: set(),
+    OrderStatus.CANCELLED: set(),
+}
+
+
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # Keyset pagination of a store's orders, newest first; added to an
+        # existing table, so built concurrently at startup
+        Index(
+            "ix_orders_tenant_created_id", "tenant_id", "created_at", "id",
+            info={"create_concurrently": True}
+        ),
+    )
+    # Fetch server defaults (created_at) with RETURNING on insert
+    __mapper_args__ = {"eager_defaults": "auto"}
     
     id = Column(Integer, primary_key=True, index=True)
     uuid = Column(String(36), unique=True, default=lambda: str(uuid.uuid4()), index=True)
@@ -0,0 +1,44 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, Index, Enum as SQLEnum
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+import enum
+
+
+class OutboxStatus(str, enum.Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"  # Gave up after OUTBOX_MAX_ATTEMPTS
+
+
+class OutboxEvent(Base):
+    """
+    A side effect (notification, tracking event) to run after a commit.
+    
+    Rows are written in the same transaction as the change that causes
+    them and drained by the outbox worker (python -m app.workers.outbox).
+    """
+    __tablename__ = "outbox"
+    __table_args__ = (
+        # The worker claims due rows oldest first
+        Index("ix_outbox_status_available_at", "status", "available_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False, index=True)
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=True, index=True)
+    
+    channel = Column(String(50), nullable=False)  # email, whatsapp, facebook_pixel
+    payload = Column(JSON, default=dict)
+    
+    status = Column(SQLEnum(OutboxStatus), default=OutboxStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    # Not picked up before this time (retry backoff, or a claim in progress)
+    available_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_error = Column(Text, nullable=True)
+    
+    # Relationships
+    order = relationship("Order")
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,12 +1,20 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Numeric, JSON
+from sqlalchemy import Index, Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Numeric, JSON
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, literal_column
 from app.core.database import Base
 import uuid
 
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # Storefront listing pages, newest first; added to an existing table,
+        # so built concurrently at startup
+        Index(
+            "ix_products_tenant_published_created_id", "tenant_id", "is_published", "created_at", "id",
+            info={"create_concurrently": True}
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     uuid = Column(String(36), unique=True, default=lambda: str(uuid.uuid4()), index=True)
@@ -46,3 +54,24 @@ class Product(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+
+
+def _joined_text(*columns):
+    """coalesce(a, '') || ' ' || coalesce(b, '') ..., with literals inlined so it can match an index"""
+    empty = literal_column("''")
+    expression = func.coalesce(columns[0], empty)
+    for column in columns[1:]:
+        expression = expression.op("||")(literal_column("' '")).op("||")(func.coalesce(column, empty))
+    return expression
+
+
+# Full-text search document. The 'simple' configuration doesn't stem, which
+# works for Bangla and English alike. Matches ix_products_search_document
+# (app.services.product_search), so the two must stay identical.
+product_search_document = func.to_tsvector(
+    literal_column("'simple'::regconfig"),
+    _joined_text(Product.title, Product.title_bn, Product.description, Product.description_bn),
+)
+
+# Titles for trigram (fuzzy and substring) matching; matches ix_products_search_titles_trgm
+product_search_titles = _joined_text(Product.title, Product.title_bn)
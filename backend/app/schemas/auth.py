@@ -2,24 +2,33 @@ from pydantic import BaseModel, Field, validator
 from typing import Optional
 
 
+def normalize_phone(v: str) -> str:
+    # Remove spaces, dashes, and ensure it starts with country code or local format
+    v = v.replace(" ", "").replace("-", "").replace("+", "")
+    if not v.isdigit():
+        raise ValueError("Phone number must contain only digits")
+    # Bangladesh phone numbers: 01XXXXXXXXX (11 digits) or 8801XXXXXXXXX (13 digits)
+    if len(v) < 10 or len(v) > 15:
+        raise ValueError("Invalid phone number length")
+    return v
+
+
 class OTPRequest(BaseModel):
     phone: str = Field(..., min_length=10, max_length=15, description="Phone number")
     
     @validator("phone")
     def validate_phone(cls, v):
-        # Remove spaces, dashes, and ensure it starts with country code or local format
-        v = v.replace(" ", "").replace("-", "").replace("+", "")
-        if not v.isdigit():
-            raise ValueError("Phone number must contain only digits")
-        # Bangladesh phone numbers: 01XXXXXXXXX (11 digits) or 8801XXXXXXXXX (13 digits)
-        if len(v) < 10 or len(v) > 15:
-            raise ValueError("Invalid phone number length")
-        return v
+        return normalize_phone(v)
 
 
 class OTPVerify(BaseModel):
     phone: str = Field(..., min_length=10, max_length=15)
     otp: str = Field(..., min_length=4, max_length=6)
+    
+    @validator("phone")
+    def validate_phone(cls, v):
+        # Must match the normalization used when the OTP was requested
+        return normalize_phone(v)
 
 
 class PasswordLogin(BaseModel):
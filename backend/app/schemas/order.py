@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from decimal import Decimal
+from datetime import datetime
 from app.models.order import OrderStatus
 
 
@@ -30,6 +31,13 @@ class OrderUpdate(BaseModel):
     notes: Optional[str] = None
 
 
+class OrderBulkStatusUpdate(BaseModel):
+    status: OrderStatus
+    # Either explicit order ids, or every order currently in from_status (or both)
+    order_ids: Optional[List[int]] = Field(None, min_items=1, max_items=1000)
+    from_status: Optional[OrderStatus] = None
+
+
 class OrderItemResponse(BaseModel):
     id: int
     product_id: int
@@ -57,8 +65,25 @@ class OrderResponse(BaseModel):
     payment_method: str
     payment_status: str
     items: List[OrderItemResponse]
-    created_at: str
+    created_at: datetime
     
     class Config:
         from_attributes = True
 
+
+
+class OrderPage(BaseModel):
+    items: List[OrderResponse]
+    next_cursor: Optional[str] = None
+
+
+class OrderBulkStatusResult(BaseModel):
+    order_id: int
+    result: str  # updated, unchanged, invalid_transition, not_found
+    status: Optional[OrderStatus] = None
+
+
+class OrderBulkStatusResponse(BaseModel):
+    status: OrderStatus
+    updated: int
+    results: List[OrderBulkStatusResult]
@@ -58,3 +58,44 @@ class ProductResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+
+class ProductSummary(BaseModel):
+    """Product fields for listing pages (no descriptions or SEO text)"""
+    id: int
+    uuid: str
+    title: str
+    title_bn: Optional[str]
+    price: Decimal
+    discount_price: Optional[Decimal]
+    stock_quantity: int
+    is_in_stock: bool
+    images: List[str]
+    slug: Optional[str]
+    is_published: bool
+    is_featured: bool
+    
+    class Config:
+        from_attributes = True
+
+
+class ProductPage(BaseModel):
+    items: List[ProductSummary]
+    next_cursor: Optional[str] = None
+
+
+class ProductImportFieldError(BaseModel):
+    field: Optional[str] = None
+    message: str
+
+
+class ProductImportError(BaseModel):
+    """A row that was not imported; row is the line number in the uploaded file"""
+    row: int
+    errors: List[ProductImportFieldError]
+
+
+class ProductImportResponse(BaseModel):
+    imported: int
+    failed: int
+    errors: List[ProductImportError]
@@ -0,0 +1,242 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from app.core.cache import TTLCache, MISSING, invalidation_bus
+from app.core.config import settings
+from app.core.redis import get_redis
+import hashlib
+import json
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CatalogVersion:
+    tag: str
+    modified: datetime
+
+
+class CatalogVersions:
+    """
+    Per-tenant version of everything the storefront shows.
+
+    Any write to a tenant's products, shipping classes, store settings or
+    stock must call bump() after committing. Storefront responses are
+    validated (and, later on, cached) against the current version, so a
+    single bump invalidates all of them at once.
+
+    Redis holds the current version for every worker; each worker keeps a
+    copy for CATALOG_VERSION_TTL_SECONDS, dropped as soon as a bump is
+    broadcast. Without Redis each worker keeps its own versions until it
+    makes a bump itself, so ETags stay put while nothing changes; a bump is
+    then only seen by that worker, so run a single worker process or
+    configure Redis.
+    """
+
+    TOPIC = "catalog"
+
+    def __init__(self):
+        self._cache = TTLCache(
+            "catalog_versions",
+            maxsize=settings.CATALOG_VERSION_CACHE_MAX_SIZE,
+            ttl=settings.CATALOG_VERSION_TTL_SECONDS,
+        )
+        # Bumped on invalidation so an in-flight load can't cache stale data
+        self._generation = 0
+        # Versions used while Redis is not available, kept until a bump
+        self._local: Dict[int, CatalogVersion] = {}
+        invalidation_bus.subscribe(self.TOPIC, self._on_invalidate)
+
+    @staticmethod
+    def _key(tenant_id: int) -> str:
+        return f"catalog:version:{tenant_id}"
+
+    @staticmethod
+    def _new_version() -> CatalogVersion:
+        # Random tags can't collide with ETags handed out before Redis lost its data
+        return CatalogVersion(
+            tag=uuid.uuid4().hex,
+            modified=datetime.now(timezone.utc).replace(microsecond=0),
+        )
+
+    @staticmethod
+    def _encode(version: CatalogVersion) -> str:
+        return f"{version.tag}:{int(version.modified.timestamp())}"
+
+    @staticmethod
+    def _decode(raw: str) -> CatalogVersion:
+        tag, timestamp = raw.rsplit(":", 1)
+        return CatalogVersion(tag=tag, modified=datetime.fromtimestamp(int(timestamp), timezone.utc))
+
+    def _local_version(self, tenant_id: int) -> CatalogVersion:
+        version = self._local.get(tenant_id)
+        if version is None:
+            version = self._local[tenant_id] = self._new_version()
+        return version
+
+    async def get(self, tenant_id: int) -> CatalogVersion:
+        """Current catalog version of a tenant"""
+        redis = get_redis()
+        if redis is None:
+            return self._local_version(tenant_id)
+
+        version = self._cache.get(tenant_id)
+        if version is not MISSING:
+            return version
+
+        generation = self._generation
+        try:
+            raw = await redis.get(self._key(tenant_id))
+            if raw is None:
+                # First use: whoever sets it first wins
+                await redis.set(self._key(tenant_id), self._encode(self._new_version()), nx=True)
+                raw = await redis.get(self._key(tenant_id))
+            version = self._decode(raw)
+        except Exception as e:
+            logger.warning(f"Failed to read catalog version of tenant {tenant_id}: {e}")
+            version = self._local_version(tenant_id)
+
+        if generation == self._generation:
+            self._cache.set(tenant_id, version)
+        return version
+
+    async def bump(self, tenant_id: int):
+        """Start a new catalog version for a tenant, in every worker"""
+        previous = await self.get(tenant_id)
+        version = self._new_version()
+        if version.modified <= previous.modified:
+            # Last-Modified has one second resolution; keep it increasing so
+            # If-Modified-Since can't match the old version after two quick writes
+            version = CatalogVersion(tag=version.tag, modified=previous.modified + timedelta(seconds=1))
+
+        self._local[tenant_id] = version
+        redis = get_redis()
+        if redis is not None:
+            try:
+                await redis.set(self._key(tenant_id), self._encode(version))
+            except Exception as e:
+                logger.error(f"Failed to store catalog version of tenant {tenant_id}: {e}")
+
+        await invalidation_bus.publish(self.TOPIC, tenant_id)
+        self._cache.set(tenant_id, version)
+
+    def _on_invalidate(self, tenant_id: Optional[int]):
+        self._generation += 1
+        if tenant_id is None:
+            self._cache.clear()
+        else:
+            self._cache.delete(tenant_id)
+
+
+catalog_versions = CatalogVersions()
+
+
+class CatalogValidators:
+    """
+    ETag / Last-Modified for one storefront response.
+
+    The ETag is strong: it is derived from the tenant's catalog version, the
+    route and the parsed values of the parameters the route declares, and
+    every representation for those is built from the catalog at that
+    version. Undeclared query parameters, their order and spelling
+    (?limit=020) don't change it, so they can't mint new cache entries.
+    """
+
+    def __init__(self, request: Request, tenant_id: int, version: CatalogVersion, params: dict):
+        route = request.scope.get("route")
+        resource = json.dumps(
+            [route.path if route is not None else request.url.path, params],
+            sort_keys=True,
+            default=str,
+        )
+        digest = hashlib.sha256(f"{version.tag}|{resource}".encode()).hexdigest()[:32]
+        self.tenant_id = tenant_id
+        self.version = version
+        self.etag = f'"{digest}"'
+        self.headers = {
+            "ETag": self.etag,
+            "Last-Modified": format_datetime(version.modified, usegmt=True),
+            "Cache-Control": settings.STOREFRONT_CACHE_CONTROL,
+        }
+        self.not_modified = self._is_fresh(request)
+
+    def _is_fresh(self, request: Request) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            # If-Modified-Since is ignored when If-None-Match is present
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or any(tag.removeprefix("W/") == self.etag for tag in tags)
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            return self.version.modified <= since
+
+        return False
+
+    def not_modified_response(self) -> Response:
+        """304 with no body"""
+        return Response(status_code=304, headers=self.headers)
+
+
+async def catalog_validators(request: Request, tenant_id: int, **params: Any) -> CatalogValidators:
+    """
+    Validators for a storefront response of a tenant; check .not_modified first.
+
+    Pass every path and query parameter the response depends on, as parsed
+    by the endpoint.
+    """
+    return CatalogValidators(request, tenant_id, await catalog_versions.get(tenant_id), params)
+
+
+class CatalogResponseCache:
+    """
+    Serialized storefront responses, per worker.
+
+    Entries are keyed by tenant and ETag, which already covers the catalog
+    version, route and parameters, so a bump makes every older entry
+    unreachable at once; they age out through the TTL and LRU eviction.
+    The total size of the stored bodies is bounded as well as their count.
+    A hit returns the stored JSON bytes without touching the database or
+    Pydantic.
+    """
+
+    def __init__(self):
+        self._cache = TTLCache(
+            "catalog_responses",
+            maxsize=settings.CATALOG_RESPONSE_CACHE_MAX_SIZE,
+            ttl=settings.CATALOG_RESPONSE_CACHE_TTL_SECONDS,
+            maxbytes=settings.CATALOG_RESPONSE_CACHE_MAX_TOTAL_BYTES,
+        )
+
+    def get(self, validators: CatalogValidators) -> Optional[Response]:
+        """Cached response for these validators, or None"""
+        body = self._cache.get((validators.tenant_id, validators.etag), None)
+        if body is None:
+            return None
+        return self._response(validators, body)
+
+    def store(self, validators: CatalogValidators, adapter: TypeAdapter, value: Any) -> Response:
+        """Serialize a response the way its response_model would, cache and return it"""
+        body = adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+        # Don't let a few huge listings push everything else out
+        if len(body) <= settings.CATALOG_RESPONSE_CACHE_MAX_BYTES:
+            self._cache.set((validators.tenant_id, validators.etag), body)
+        return self._response(validators, body)
+
+    @staticmethod
+    def _response(validators: CatalogValidators, body: bytes) -> Response:
+        return Response(content=body, media_type="application/json", headers=validators.headers)
+
+
+catalog_responses = CatalogResponseCache()
@@ -0,0 +1,198 @@
+from dataclasses import dataclass
+from typing import Any, Optional
+from app.core.config import settings
+from app.core.redis import get_redis
+import asyncio
+import hashlib
+import json
+import time
+
+
+class IdempotencyKeyReused(Exception):
+    """The key was already used for a request with a different body"""
+
+
+class IdempotencyKeyInFlight(Exception):
+    """Another request with the same key is still running"""
+
+
+@dataclass
+class StoredResponse:
+    status_code: int
+    body: Any
+
+
+def request_fingerprint(payload: dict) -> str:
+    """Stable digest of a request body, to catch a key being reused for a different request"""
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class RedisIdempotencyStore:
+    """
+    Idempotency keys on Redis, shared by every worker.
+
+    claim() takes a key with SET NX for IDEMPOTENCY_LOCK_SECONDS. Whoever
+    gets it runs the request and then either completes the key (storing the
+    response for IDEMPOTENCY_TTL_SECONDS) or releases it so the client can
+    retry. Duplicates poll until one of those happens.
+    """
+
+    POLL_SECONDS = 0.1
+
+    # KEYS: key; ARGV: owner, new value, ttl. Only the owner may complete.
+    COMPLETE_SCRIPT = """
+    local stored = redis.call('GET', KEYS[1])
+    if stored and cjson.decode(stored)['owner'] == ARGV[1] then
+        redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+        return 1
+    end
+    return 0
+    """
+
+    # KEYS: key; ARGV: owner. Only the owner may release.
+    RELEASE_SCRIPT = """
+    local stored = redis.call('GET', KEYS[1])
+    if stored and cjson.decode(stored)['owner'] == ARGV[1] then
+        return redis.call('DEL', KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, redis):
+        self.redis = redis
+        self._complete = redis.register_script(self.COMPLETE_SCRIPT)
+        self._release = redis.register_script(self.RELEASE_SCRIPT)
+
+    async def claim(self, key: str, fingerprint: str, owner: str) -> Optional[StoredResponse]:
+        """Claim a key; returns None if claimed, or the stored response of the first request"""
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+        pending = json.dumps({"fingerprint": fingerprint, "owner": owner})
+
+        while True:
+            if await self.redis.set(key, pending, nx=True, ex=settings.IDEMPOTENCY_LOCK_SECONDS):
+                return None
+
+            stored = await self.redis.get(key)
+            if stored is None:
+                # Released or expired in between, try again
+                continue
+
+            entry = json.loads(stored)
+            if entry["fingerprint"] != fingerprint:
+                raise IdempotencyKeyReused()
+            if "status_code" in entry:
+                return StoredResponse(entry["status_code"], entry["body"])
+            if time.monotonic() >= deadline:
+                raise IdempotencyKeyInFlight()
+
+            await asyncio.sleep(self.POLL_SECONDS)
+
+    async def complete(self, key: str, fingerprint: str, owner: str, response: StoredResponse):
+        """Store the response of a claimed key"""
+        value = json.dumps({
+            "fingerprint": fingerprint,
+            "owner": owner,
+            "status_code": response.status_code,
+            "body": response.body,
+        })
+        await self._complete(keys=[key], args=[owner, value, settings.IDEMPOTENCY_TTL_SECONDS])
+
+    async def release(self, key: str, owner: str):
+        """Give up a claimed key without storing anything"""
+        await self._release(keys=[key], args=[owner])
+
+
+class MemoryIdempotencyStore:
+    """
+    In-process stand-in for RedisIdempotencyStore.
+
+    Used when Redis is not available, which only protects against duplicates
+    hitting the same worker. Duplicates wait on a future instead of polling.
+    """
+
+    def __init__(self):
+        # key -> {"fingerprint", "owner", "expires_at", and "done" (future) or "response"}
+        self._entries = {}
+
+    def _prune(self, now: float):
+        self._entries = {k: v for k, v in self._entries.items() if v["expires_at"] > now}
+
+    def _get(self, key: str, now: float):
+        entry = self._entries.get(key)
+        if entry is not None and entry["expires_at"] <= now:
+            self._drop(key)
+            return None
+        return entry
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None and "done" in entry and not entry["done"].done():
+            entry["done"].set_result(None)
+
+    async def claim(self, key: str, fingerprint: str, owner: str) -> Optional[StoredResponse]:
+        """Claim a key; returns None if claimed, or the stored response of the first request"""
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+
+        while True:
+            now = time.monotonic()
+            entry = self._get(key, now)
+
+            if entry is None:
+                if len(self._entries) > 10000:
+                    self._prune(now)
+                self._entries[key] = {
+                    "fingerprint": fingerprint,
+                    "owner": owner,
+                    "expires_at": now + settings.IDEMPOTENCY_LOCK_SECONDS,
+                    "done": asyncio.get_running_loop().create_future(),
+                }
+                return None
+
+            if entry["fingerprint"] != fingerprint:
+                raise IdempotencyKeyReused()
+            if "response" in entry:
+                return entry["response"]
+
+            if now >= deadline:
+                raise IdempotencyKeyInFlight()
+            try:
+                await asyncio.wait_for(
+                    asyncio.shield(entry["done"]), min(deadline, entry["expires_at"]) - now
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def complete(self, key: str, fingerprint: str, owner: str, response: StoredResponse):
+        """Store the response of a claimed key"""
+        entry = self._get(key, time.monotonic())
+        if entry is None or entry["owner"] != owner:
+            return
+
+        done = entry.pop("done")
+        entry["response"] = response
+        entry["expires_at"] = time.monotonic() + settings.IDEMPOTENCY_TTL_SECONDS
+        done.set_result(None)
+
+    async def release(self, key: str, owner: str):
+        """Give up a claimed key without storing anything"""
+        entry = self._entries.get(key)
+        if entry is not None and entry["owner"] == owner:
+            self._drop(key)
+
+
+_memory_store = MemoryIdempotencyStore()
+_redis_store = None
+
+
+def get_idempotency_store():
+    """Get the Redis-backed store, or the in-process one without Redis"""
+    global _redis_store
+
+    redis = get_redis()
+    if redis is None:
+        return _memory_store
+
+    if _redis_store is None or _redis_store.redis is not redis:
+        _redis_store = RedisIdempotencyStore(redis)
+    return _redis_store
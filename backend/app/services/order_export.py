@@ -0,0 +1,179 @@
+from typing import AsyncIterator, Optional
+from sqlalchemy import select
+from app.core.database import AsyncSessionLocal
+from app.models.order import Order, OrderItem, OrderStatus
+from datetime import datetime
+import csv
+import io
+import json
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+ORDER_COLUMNS = [
+    Order.id,
+    Order.order_number,
+    Order.created_at,
+    Order.status,
+    Order.customer_name,
+    Order.customer_phone,
+    Order.customer_email,
+    Order.customer_address,
+    Order.payment_method,
+    Order.payment_status,
+    Order.subtotal,
+    Order.shipping_cost,
+    Order.total,
+]
+
+ITEM_COLUMNS = [
+    OrderItem.product_id,
+    OrderItem.product_title,
+    OrderItem.product_price,
+    OrderItem.quantity,
+    OrderItem.subtotal.label("item_subtotal"),
+]
+
+CSV_HEADER = [
+    "order_number", "created_at", "status", "customer_name", "customer_phone",
+    "customer_email", "customer_address", "payment_method", "payment_status",
+    "subtotal", "shipping_cost", "total", "product_id", "product_title",
+    "product_price", "quantity", "item_subtotal",
+]
+
+# Text cells must not be evaluated as formulas by spreadsheets; most of
+# them (phone, payment method, ...) come straight from the anonymous checkout
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def build_export_query(
+    tenant_id: int,
+    status_filter: Optional[OrderStatus] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+):
+    """One row per order item, in order creation order"""
+    query = (
+        select(*ORDER_COLUMNS, *ITEM_COLUMNS)
+        .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+        .where(Order.tenant_id == tenant_id)
+    )
+
+    if status_filter:
+        query = query.where(Order.status == status_filter)
+    if created_from:
+        query = query.where(Order.created_at >= created_from)
+    if created_to:
+        query = query.where(Order.created_at < created_to)
+
+    return query.order_by(Order.created_at, Order.id, OrderItem.id)
+
+
+def _text(value: Optional[str]) -> str:
+    if value and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value or ""
+
+
+def _value(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, OrderStatus):
+        return value.value
+    # Decimal money amounts go out as strings, like the JSON API
+    return str(value)
+
+
+async def _stream_rows(query) -> AsyncIterator[list]:
+    """
+    Yield batches of rows from a server-side cursor.
+
+    Uses its own session rather than the request's: the response body is
+    produced after the endpoint returns, and the cursor needs its
+    connection (and transaction) for the whole download.
+    """
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(
+            query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        async for rows in result.partitions():
+            yield rows
+
+
+async def export_orders_csv(query) -> AsyncIterator[str]:
+    """Stream orders as CSV, one line per order item"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    # The BOM makes Excel read the file as UTF-8, so Bangla text shows correctly
+    buffer.write("\ufeff")
+    writer.writerow(CSV_HEADER)
+    yield buffer.getvalue()
+
+    async for rows in _stream_rows(query):
+        buffer.seek(0)
+        buffer.truncate()
+        for row in rows:
+            writer.writerow([
+                _text(row.order_number),
+                _value(row.created_at),
+                _value(row.status),
+                _text(row.customer_name),
+                _text(row.customer_phone),
+                _text(row.customer_email),
+                _text(row.customer_address),
+                _text(row.payment_method),
+                _text(row.payment_status),
+                _value(row.subtotal),
+                _value(row.shipping_cost),
+                _value(row.total),
+                row.product_id,
+                _text(row.product_title),
+                _value(row.product_price),
+                row.quantity,
+                _value(row.item_subtotal),
+            ])
+        yield buffer.getvalue()
+
+
+async def export_orders_ndjson(query) -> AsyncIterator[str]:
+    """Stream orders as newline-delimited JSON, one object per order with its items"""
+    current = None
+
+    async for rows in _stream_rows(query):
+        lines = []
+        for row in rows:
+            if current is None or current["id"] != row.id:
+                if current is not None:
+                    lines.append(json.dumps(current, ensure_ascii=False))
+                current = {
+                    "id": row.id,
+                    "order_number": row.order_number,
+                    "created_at": _value(row.created_at),
+                    "status": _value(row.status),
+                    "customer_name": row.customer_name,
+                    "customer_phone": row.customer_phone,
+                    "customer_email": row.customer_email,
+                    "customer_address": row.customer_address,
+                    "payment_method": row.payment_method,
+                    "payment_status": row.payment_status,
+                    "subtotal": _value(row.subtotal),
+                    "shipping_cost": _value(row.shipping_cost),
+                    "total": _value(row.total),
+                    "items": [],
+                }
+            if row.product_id is not None:
+                current["items"].append({
+                    "product_id": row.product_id,
+                    "product_title": row.product_title,
+                    "product_price": _value(row.product_price),
+                    "quantity": row.quantity,
+                    "subtotal": _value(row.item_subtotal),
+                })
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    if current is not None:
+        yield json.dumps(current, ensure_ascii=False) + "\n"
@@ -0,0 +1,129 @@
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.tenant_context import TenantContext
+from app.models.order import Order
+from app.models.outbox import OutboxEvent
+from app.services.email import EmailService
+from app.services.whatsapp import WhatsAppService
+from app.services.facebook_pixel import FacebookPixelService
+
+EMAIL = "email"
+WHATSAPP = "whatsapp"
+FACEBOOK_PIXEL = "facebook_pixel"
+
+
+def enqueue_order_notifications(
+    db: AsyncSession,
+    tenant: TenantContext,
+    order: Order,
+    fb_pixel_id: Optional[str] = None,
+    fb_event_id: Optional[str] = None
+):
+    """
+    Queue the new-order notifications in the outbox.
+    
+    Adds the rows to the session, so they are committed together with the
+    order; the outbox worker sends them. Channels the platform has no
+    credentials for are skipped rather than queued to fail.
+    """
+    if tenant.email_notifications and tenant.notification_email and settings.SMTP_HOST:
+        db.add(OutboxEvent(tenant_id=tenant.id, order=order, channel=EMAIL))
+    
+    if tenant.whatsapp_notifications and tenant.notification_whatsapp and settings.WHATSAPP_API_KEY:
+        db.add(OutboxEvent(tenant_id=tenant.id, order=order, channel=WHATSAPP))
+    
+    # Track Facebook Pixel event
+    if tenant.enable_facebook_pixel and tenant.facebook_access_token and fb_pixel_id:
+        db.add(OutboxEvent(
+            tenant_id=tenant.id,
+            order=order,
+            channel=FACEBOOK_PIXEL,
+            payload={"event_id": fb_event_id}
+        ))
+
+
+async def send_outbox_event(channel: str, tenant: TenantContext, order: Order, payload: dict) -> bool:
+    """Run one queued notification; returns False if it should be retried"""
+    if channel == EMAIL:
+        return await send_order_notification_email(tenant, order)
+    if channel == WHATSAPP:
+        return await send_order_notification_whatsapp(tenant, order)
+    if channel == FACEBOOK_PIXEL:
+        return await track_facebook_pixel_purchase(tenant, order, payload.get("event_id"))
+    raise ValueError(f"Unknown outbox channel: {channel}")
+
+
+async def send_order_notification_email(tenant: TenantContext, order: Order):
+    """Send email notification to store owner"""
+    email_service = EmailService()
+    
+    subject = "নতুন অর্ডার এসেছে"  # New order received
+    
+    html_body = f"""
+    <html>
+    <body style="font-family: Arial, sans-serif;">
+        <h2>নতুন অর্ডার এসেছে</h2>
+        <p>আপনার স্টোরে একটি নতুন অর্ডার এসেছে।</p>
+        <p><strong>অর্ডার নম্বর:</strong> {order.order_number}</p>
+        <p><strong>গ্রাহকের নাম:</strong> {order.customer_name}</p>
+        <p><strong>মোবাইল নম্বর:</strong> {order.customer_phone}</p>
+        <p><strong>ঠিকানা:</strong> {order.customer_address}</p>
+        <p><strong>মোট পরিমাণ:</strong> {order.total} {tenant.currency}</p>
+    </body>
+    </html>
+    """
+    
+    return await email_service.send_email(
+        tenant.notification_email,
+        subject,
+        html_body
+    )
+
+
+async def send_order_notification_whatsapp(tenant: TenantContext, order: Order):
+    """Send WhatsApp notification to store owner"""
+    whatsapp_service = WhatsAppService()
+    
+    message = f"""নতুন অর্ডার এসেছে
+
+অর্ডার নম্বর: {order.order_number}
+গ্রাহকের নাম: {order.customer_name}
+মোবাইল: {order.customer_phone}
+ঠিকানা: {order.customer_address}
+মোট: {order.total} {tenant.currency}"""
+    
+    return await whatsapp_service.send_message(
+        tenant.notification_whatsapp,
+        message
+    )
+
+
+async def track_facebook_pixel_purchase(tenant: TenantContext, order: Order, event_id: str):
+    """Track purchase event via Facebook Pixel"""
+    pixel_service = FacebookPixelService()
+    
+    # Get product IDs from order items
+    content_ids = [str(item.product_id) for item in order.items]
+    
+    event_data = {
+        "event_time": int(order.created_at.timestamp()),
+        "event_id": event_id or f"order_{order.id}",
+        "event_source_url": f"https://{tenant.slug}.{tenant.slug}/order/{order.id}",
+        "user_data": {
+            "phone": order.customer_phone,
+            "email": order.customer_email
+        },
+        "custom_data": {
+            "value": float(order.total),
+            "currency": tenant.currency,
+            "content_ids": content_ids,
+            "num_items": sum(item.quantity for item in order.items)
+        }
+    }
+    
+    return await pixel_service.track_purchase(
+        tenant.facebook_pixel_id,
+        tenant.facebook_access_token,
+        event_data
+    )
@@ -0,0 +1,208 @@
+from typing import Optional
+from app.core.config import settings
+from app.core.redis import get_redis
+import asyncio
+import logging
+import random
+import string
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Crockford base32: no I, L, O or U, so numbers are easy to read out on the phone
+CROCKFORD_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
+class OrderNumbersUnavailable(RuntimeError):
+    """No worker id is held that numbers can safely be issued with"""
+
+
+class RandomOrderNumberGenerator:
+    """Legacy generator: 8 random characters, uniqueness left to the database"""
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    def next(self) -> str:
+        random_part = ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
+        return f"ORD-{random_part}"
+
+
+class SnowflakeOrderNumberGenerator:
+    """
+    Time-ordered order numbers that are unique without a retry loop.
+
+    Each number packs milliseconds since EPOCH_MS (41 bits), a worker id
+    (10 bits) and a per-millisecond sequence (12 bits). It is rendered as 13
+    fixed-width Crockford base32 characters, e.g. ORD-01HV3K9ZQ0R8A, so
+    numbers sort by creation time and inserts land at the end of the
+    order_number index.
+
+    Uniqueness depends on every running process having its own worker id.
+    It comes from ORDER_NUMBER_WORKER_ID when set, otherwise from a lease in
+    Redis; without either, start() refuses to run rather than guess one.
+    A leased id is only used while the lease is known to be held: if it
+    can't be renewed in time or another process has taken it over, next()
+    raises OrderNumbersUnavailable until a new id is leased.
+    """
+
+    EPOCH_MS = 1704067200000  # 2024-01-01T00:00:00Z
+    WORKER_BITS = 10
+    SEQUENCE_BITS = 12
+    MAX_WORKERS = 1 << WORKER_BITS
+    SEQUENCE_MASK = (1 << SEQUENCE_BITS) - 1
+    LEASE_SECONDS = 60
+
+    # KEYS: lease key; ARGV: owner, ttl in ms. Only the owner may renew.
+    RENEW_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    end
+    return 0
+    """
+
+    def __init__(self, worker_id: Optional[int] = None):
+        if worker_id is not None and not 0 <= worker_id < self.MAX_WORKERS:
+            raise ValueError(f"Order number worker id must be between 0 and {self.MAX_WORKERS - 1}")
+        self.worker_id = worker_id
+        self._configured = worker_id is not None
+        self._last_ms = -1
+        self._sequence = 0
+        self._lease_owner = uuid.uuid4().hex
+        # Monotonic time by which the lease may have expired in Redis
+        self._lease_expires_at = 0.0
+        self._lease_task: Optional[asyncio.Task] = None
+        self._renew = None
+
+    async def start(self):
+        """Claim a worker id lease in Redis unless one was configured"""
+        if self._configured:
+            return
+
+        redis = get_redis()
+        if redis is None:
+            # Process ids repeat across containers and hosts, so they can't stand in
+            raise RuntimeError(
+                "Order numbers need a unique worker id: set ORDER_NUMBER_WORKER_ID per process, "
+                "configure Redis, or use ORDER_NUMBER_STRATEGY=random"
+            )
+
+        self._renew = redis.register_script(self.RENEW_SCRIPT)
+        if not await self._claim():
+            raise RuntimeError("No free order number worker id")
+        self._lease_task = asyncio.create_task(self._keep_lease())
+
+    async def stop(self):
+        """Release the worker id lease"""
+        if self._lease_task is None:
+            return
+
+        self._lease_task.cancel()
+        try:
+            await self._lease_task
+        except asyncio.CancelledError:
+            pass
+        self._lease_task = None
+
+        redis = get_redis()
+        if redis is not None and self.worker_id is not None:
+            try:
+                if await redis.get(self._lease_key(self.worker_id)) == self._lease_owner:
+                    await redis.delete(self._lease_key(self.worker_id))
+            except Exception as e:
+                logger.warning(f"Failed to release order number worker id: {e}")
+
+    def _lease_key(self, worker_id: int) -> str:
+        return f"order_number:worker:{worker_id}"
+
+    async def _claim(self) -> bool:
+        """Lease a free worker id; False if every id is taken"""
+        redis = get_redis()
+        first = random.randrange(self.MAX_WORKERS)
+        for offset in range(self.MAX_WORKERS):
+            candidate = (first + offset) % self.MAX_WORKERS
+            requested_at = time.monotonic()
+            claimed = await redis.set(
+                self._lease_key(candidate), self._lease_owner, nx=True, ex=self.LEASE_SECONDS
+            )
+            if claimed:
+                self.worker_id = candidate
+                self._lease_expires_at = requested_at + self.LEASE_SECONDS
+                logger.info(f"Order number worker id {candidate} leased")
+                return True
+
+        return False
+
+    async def _keep_lease(self):
+        while True:
+            await asyncio.sleep(self.LEASE_SECONDS / 3)
+            try:
+                if self.worker_id is None:
+                    # The lease was lost; no numbers until another id is leased
+                    await self._claim()
+                    continue
+
+                requested_at = time.monotonic()
+                renewed = await self._renew(
+                    keys=[self._lease_key(self.worker_id)],
+                    args=[self._lease_owner, self.LEASE_SECONDS * 1000]
+                )
+                if renewed:
+                    self._lease_expires_at = requested_at + self.LEASE_SECONDS
+                else:
+                    logger.error(f"Order number worker id {self.worker_id} was leased by another process")
+                    self.worker_id = None
+            except Exception as e:
+                logger.warning(f"Failed to renew order number worker id lease: {e}")
+
+    def next(self) -> str:
+        if self.worker_id is None:
+            raise OrderNumbersUnavailable("No order number worker id")
+        if not self._configured and time.monotonic() >= self._lease_expires_at:
+            # Redis may already have handed the id to another process
+            raise OrderNumbersUnavailable(f"Order number worker id {self.worker_id} lease expired")
+
+        now_ms = int(time.time() * 1000) - self.EPOCH_MS
+
+        # Never go backwards, even if the wall clock does
+        if now_ms <= self._last_ms:
+            now_ms = self._last_ms
+            self._sequence = (self._sequence + 1) & self.SEQUENCE_MASK
+            if self._sequence == 0:
+                # Sequence exhausted for this millisecond; borrow the next one
+                now_ms += 1
+        else:
+            self._sequence = 0
+
+        self._last_ms = now_ms
+        value = (
+            (now_ms << (self.WORKER_BITS + self.SEQUENCE_BITS))
+            | (self.worker_id << self.SEQUENCE_BITS)
+            | self._sequence
+        )
+        return f"ORD-{encode_base32(value, 13)}"
+
+
+def encode_base32(value: int, width: int) -> str:
+    """Fixed-width Crockford base32, so lexical order matches numeric order"""
+    chars = []
+    for _ in range(width):
+        chars.append(CROCKFORD_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def create_order_number_generator():
+    """Build the generator selected by ORDER_NUMBER_STRATEGY"""
+    if settings.ORDER_NUMBER_STRATEGY == "random":
+        return RandomOrderNumberGenerator()
+
+    worker_id = settings.ORDER_NUMBER_WORKER_ID.strip()
+    return SnowflakeOrderNumberGenerator(int(worker_id) if worker_id else None)
+
+
+order_number_generator = create_order_number_generator()
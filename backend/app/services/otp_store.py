@@ -0,0 +1,161 @@
+from app.core.config import settings
+from app.core.redis import get_redis
+import enum
+import hashlib
+import hmac
+import math
+import time
+
+
+class OTPResult(str, enum.Enum):
+    VALID = "valid"
+    INVALID = "invalid"
+    EXPIRED = "expired"
+    TOO_MANY_ATTEMPTS = "too_many_attempts"
+
+
+def _digest(phone: str, otp: str) -> str:
+    """Codes are stored as keyed digests, never in plain text"""
+    return hmac.new(
+        settings.SECRET_KEY.encode(), f"{phone}:{otp}".encode(), hashlib.sha256
+    ).hexdigest()
+
+
+class RedisOTPStore:
+    """
+    OTP storage on Redis.
+
+    Issue and verify are each a single Lua script, so the expiry, resend
+    cooldown and attempt counter are checked and updated atomically in one
+    round trip. A successful verify deletes the code (compare-and-delete),
+    so a code can only be used once.
+    """
+
+    # KEYS: code, attempts, cooldown; ARGV: digest, ttl, cooldown
+    # Returns 0 when issued, otherwise milliseconds left on the cooldown
+    ISSUE_SCRIPT = """
+    local wait = redis.call('PTTL', KEYS[3])
+    if wait > 0 then
+        return wait
+    end
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+    redis.call('DEL', KEYS[2])
+    redis.call('SET', KEYS[3], '1', 'EX', ARGV[3])
+    return 0
+    """
+
+    # KEYS: code, attempts; ARGV: digest, max attempts
+    VERIFY_SCRIPT = """
+    local stored = redis.call('GET', KEYS[1])
+    if not stored then
+        return 'expired'
+    end
+    local attempts = redis.call('INCR', KEYS[2])
+    if attempts == 1 then
+        redis.call('PEXPIRE', KEYS[2], redis.call('PTTL', KEYS[1]))
+    end
+    if attempts > tonumber(ARGV[2]) then
+        redis.call('DEL', KEYS[1], KEYS[2])
+        return 'too_many_attempts'
+    end
+    if stored == ARGV[1] then
+        redis.call('DEL', KEYS[1], KEYS[2])
+        return 'valid'
+    end
+    return 'invalid'
+    """
+
+    def __init__(self, redis):
+        self.redis = redis
+        self._issue = redis.register_script(self.ISSUE_SCRIPT)
+        self._verify = redis.register_script(self.VERIFY_SCRIPT)
+
+    @staticmethod
+    def _keys(phone: str):
+        return [f"otp:{phone}:code", f"otp:{phone}:attempts", f"otp:{phone}:cooldown"]
+
+    async def issue(self, phone: str, otp: str) -> int:
+        """Store a new code; returns seconds left on the resend cooldown (0 if issued)"""
+        wait_ms = await self._issue(
+            keys=self._keys(phone),
+            args=[_digest(phone, otp), settings.OTP_TTL_SECONDS, settings.OTP_RESEND_COOLDOWN_SECONDS]
+        )
+        return math.ceil(int(wait_ms) / 1000)
+
+    async def verify(self, phone: str, otp: str) -> OTPResult:
+        """Check a code, consuming it on success"""
+        result = await self._verify(
+            keys=self._keys(phone)[:2],
+            args=[_digest(phone, otp), settings.OTP_MAX_ATTEMPTS]
+        )
+        return OTPResult(result)
+
+
+class MemoryOTPStore:
+    """
+    In-process stand-in for RedisOTPStore.
+
+    Used when Redis is not available, which is fine for tests and a single
+    worker. Every operation runs without awaiting, so it is atomic on the
+    event loop.
+    """
+
+    def __init__(self):
+        # phone -> [digest, expires_at, attempts]
+        self._codes = {}
+        # phone -> cooldown end
+        self._cooldowns = {}
+
+    def _prune(self, now: float):
+        self._codes = {k: v for k, v in self._codes.items() if v[1] > now}
+        self._cooldowns = {k: v for k, v in self._cooldowns.items() if v > now}
+
+    async def issue(self, phone: str, otp: str) -> int:
+        """Store a new code; returns seconds left on the resend cooldown (0 if issued)"""
+        now = time.monotonic()
+
+        cooldown_until = self._cooldowns.get(phone, 0)
+        if cooldown_until > now:
+            return math.ceil(cooldown_until - now)
+
+        if len(self._codes) > 10000:
+            self._prune(now)
+
+        self._codes[phone] = [_digest(phone, otp), now + settings.OTP_TTL_SECONDS, 0]
+        self._cooldowns[phone] = now + settings.OTP_RESEND_COOLDOWN_SECONDS
+        return 0
+
+    async def verify(self, phone: str, otp: str) -> OTPResult:
+        """Check a code, consuming it on success"""
+        entry = self._codes.get(phone)
+        if entry is None or entry[1] <= time.monotonic():
+            self._codes.pop(phone, None)
+            return OTPResult.EXPIRED
+
+        entry[2] += 1
+        if entry[2] > settings.OTP_MAX_ATTEMPTS:
+            del self._codes[phone]
+            return OTPResult.TOO_MANY_ATTEMPTS
+
+        if hmac.compare_digest(entry[0], _digest(phone, otp)):
+            del self._codes[phone]
+            return OTPResult.VALID
+
+        return OTPResult.INVALID
+
+
+_memory_store = MemoryOTPStore()
+_redis_store = None
+
+
+def get_otp_store():
+    """Get the Redis-backed store, or the in-process one without Redis"""
+    global _redis_store
+
+    redis = get_redis()
+    if redis is None:
+        return _memory_store
+
+    if _redis_store is None or _redis_store.redis is not redis:
+        _redis_store = RedisOTPStore(redis)
+    return _redis_store
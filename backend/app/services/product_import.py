@@ -0,0 +1,278 @@
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+from fastapi import HTTPException, Request, status
+from pydantic import ValidationError
+from sqlalchemy import insert, select, Integer, Numeric, String
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.slugs import slugify
+from app.models.product import Product
+from app.schemas.product import ProductCreate, ProductImportError, ProductImportFieldError
+import codecs
+import csv
+import json
+
+# Rows per multi-row INSERT
+IMPORT_BATCH_SIZE = 1000
+
+IMPORT_COLUMNS = set(ProductCreate.model_fields)
+
+# CSV cells can't hold lists; image URLs go in one cell separated by "|"
+IMAGE_SEPARATOR = "|"
+
+# Column limits ProductCreate doesn't check itself. One value the database
+# rejects would fail its whole batch, so they are checked per row instead.
+PRODUCT_COLUMN_TYPES = {
+    column.name: column.type
+    for column in Product.__table__.columns
+    if column.name in IMPORT_COLUMNS
+}
+
+# Generated slugs are cut short enough to leave room for a "-N" suffix
+SLUG_BASE_LENGTH = PRODUCT_COLUMN_TYPES["slug"].length - 10
+
+# (row number, raw values, problem that stops the row from being validated)
+ImportRow = Tuple[int, Optional[dict], Optional[str]]
+
+
+async def _read_lines(request: Request) -> AsyncIterator[Tuple[int, str]]:
+    """Lines of the request body as they arrive, with their line numbers"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    received = 0
+    line_number = 0
+    buffer = ""
+
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > settings.MAX_UPLOAD_SIZE:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Import file is larger than {settings.MAX_UPLOAD_SIZE} bytes"
+                )
+
+            *lines, buffer = (buffer + decoder.decode(chunk)).split("\n")
+            for line in lines:
+                line_number += 1
+                yield line_number, line.rstrip("\r")
+
+        buffer += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Import file must be UTF-8 (line {line_number + 1})"
+        )
+
+    if buffer:
+        yield line_number + 1, buffer.rstrip("\r")
+
+
+async def _csv_rows(lines: AsyncIterator[Tuple[int, str]]) -> AsyncIterator[ImportRow]:
+    """Rows of a CSV file with a header line of ProductCreate field names"""
+    header = None
+    pending: List[str] = []
+    first_line = 0
+    quotes = 0
+
+    async for line_number, line in lines:
+        if not pending:
+            first_line = line_number
+        pending.append(line)
+
+        # An odd number of quotes so far means a quoted cell continues on the next line
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+
+        text = "\n".join(pending)
+        pending = []
+        quotes = 0
+        if not text.strip():
+            continue
+
+        try:
+            values = next(csv.reader([text]))
+        except csv.Error as e:
+            if header is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Invalid CSV header: {e}"
+                )
+            yield first_line, None, f"Invalid CSV: {e}"
+            continue
+
+        if header is None:
+            header = [name.strip() for name in values]
+            unknown = [name for name in header if name not in IMPORT_COLUMNS]
+            if unknown:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown columns: {', '.join(unknown)}"
+                )
+            continue
+
+        if len(values) > len(header):
+            yield first_line, None, f"Expected at most {len(header)} cells, got {len(values)}"
+            continue
+
+        # Empty cells take the field's default
+        data = {name: value.strip() for name, value in zip(header, values) if value.strip()}
+        if "images" in data:
+            data["images"] = [url.strip() for url in data["images"].split(IMAGE_SEPARATOR) if url.strip()]
+        yield first_line, data, None
+
+    if header is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Import file is empty"
+        )
+    if pending:
+        yield first_line, None, "Quoted cell is never closed"
+
+
+async def _jsonl_rows(lines: AsyncIterator[Tuple[int, str]]) -> AsyncIterator[ImportRow]:
+    """Rows of a JSON Lines file, one product object per line"""
+    async for line_number, line in lines:
+        if not line.strip():
+            continue
+
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+            continue
+
+        if not isinstance(data, dict):
+            yield line_number, None, "Each line must be a JSON object"
+            continue
+
+        yield line_number, data, None
+
+
+def _column_errors(values: dict) -> List[ProductImportFieldError]:
+    """Values that fit ProductCreate but not the products table"""
+    errors = []
+
+    for name, value in values.items():
+        column_type = PRODUCT_COLUMN_TYPES.get(name)
+        if value is None or column_type is None:
+            continue
+
+        if isinstance(column_type, String) and column_type.length and len(value) > column_type.length:
+            errors.append(ProductImportFieldError(
+                field=name, message=f"At most {column_type.length} characters"
+            ))
+        elif isinstance(column_type, Numeric) and abs(value) >= 10 ** (column_type.precision - column_type.scale):
+            errors.append(ProductImportFieldError(field=name, message="Value is too large"))
+        elif isinstance(column_type, Integer) and not isinstance(value, bool) and value > 2**31 - 1:
+            errors.append(ProductImportFieldError(field=name, message="Value is too large"))
+
+    return errors
+
+
+class SlugAllocator:
+    """
+    Unique slugs for a tenant, checked in memory.
+
+    Starts from one query for the tenant's existing slugs; a taken slug gets
+    the next free "-2", "-3", ... suffix.
+    """
+
+    def __init__(self, taken: Set[str]):
+        self.taken = taken
+        self._next_suffix: Dict[str, int] = {}
+
+    @classmethod
+    async def load(cls, db: AsyncSession, tenant_id: int) -> "SlugAllocator":
+        result = await db.execute(
+            select(Product.slug).where(
+                Product.tenant_id == tenant_id,
+                Product.slug.isnot(None)
+            )
+        )
+        return cls(set(result.scalars().all()))
+
+    def allocate(self, slug: str) -> str:
+        slug = slug or "product"
+        candidate = slug
+        suffix = self._next_suffix.get(slug, 2)
+
+        while candidate in self.taken:
+            candidate = f"{slug}-{suffix}"
+            suffix += 1
+
+        self._next_suffix[slug] = suffix
+        self.taken.add(candidate)
+        return candidate
+
+
+async def import_products(
+    db: AsyncSession,
+    tenant_id: int,
+    request: Request,
+    import_format: str,
+) -> Tuple[int, List[ProductImportError]]:
+    """
+    Validate and insert the products of an uploaded file.
+
+    Rows are validated against ProductCreate while the body is still
+    arriving. The database is only used once the whole file is in (it is
+    capped by MAX_UPLOAD_SIZE and PRODUCT_IMPORT_MAX_ROWS), so a slow
+    upload never holds a connection: then the tenant's slugs are loaded
+    and the rows inserted IMPORT_BATCH_SIZE at a time with multi-row
+    INSERTs, all in one transaction. Rows that fail are reported and
+    skipped; the rest are imported. Returns (imported, errors).
+    """
+    lines = _read_lines(request)
+    rows = _csv_rows(lines) if import_format == "csv" else _jsonl_rows(lines)
+
+    errors: List[ProductImportError] = []
+    products: List[dict] = []
+    row_count = 0
+
+    async for row, data, problem in rows:
+        row_count += 1
+        if row_count > settings.PRODUCT_IMPORT_MAX_ROWS:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Import is limited to {settings.PRODUCT_IMPORT_MAX_ROWS} rows"
+            )
+
+        if problem:
+            errors.append(ProductImportError(row=row, errors=[ProductImportFieldError(message=problem)]))
+            continue
+
+        try:
+            product = ProductCreate(**data)
+        except ValidationError as e:
+            errors.append(ProductImportError(row=row, errors=[
+                ProductImportFieldError(
+                    field=".".join(str(part) for part in error["loc"]) or None,
+                    message=error["msg"]
+                )
+                for error in e.errors()
+            ]))
+            continue
+
+        values = product.dict()
+        column_errors = _column_errors(values)
+        if column_errors:
+            errors.append(ProductImportError(row=row, errors=column_errors))
+            continue
+
+        # Made unique once the existing slugs are loaded
+        values["slug"] = (product.slug or slugify(product.title))[:SLUG_BASE_LENGTH]
+        values["tenant_id"] = tenant_id
+        products.append(values)
+
+    if not products:
+        return 0, errors
+
+    slugs = await SlugAllocator.load(db, tenant_id)
+    for values in products:
+        values["slug"] = slugs.allocate(values["slug"])
+
+    for start in range(0, len(products), IMPORT_BATCH_SIZE):
+        await db.execute(insert(Product), products[start:start + IMPORT_BATCH_SIZE])
+
+    await db.commit()
+    return len(products), errors
@@ -0,0 +1,93 @@
+from sqlalchemy import text, literal, or_, func
+from sqlalchemy.sql import literal_column
+from app.core.database import engine, index_build_connection, create_index_concurrently
+from app.models.product import product_search_document, product_search_titles
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Set at startup once pg_trgm is known to be installed
+_trigram_available = False
+
+
+def _index_expression(expression) -> str:
+    return str(expression.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+
+
+async def create_search_indexes():
+    """
+    Create the product search indexes; safe to run on every start.
+
+    Built CONCURRENTLY so a large catalog isn't locked against writes, by
+    one worker at a time; an index an interrupted build left invalid is
+    built again (see create_index_concurrently). The trigram index needs
+    the pg_trgm extension; without it (or without the rights to install
+    it) search still works, minus fuzzy matching.
+    """
+    global _trigram_available
+
+    if engine.dialect.name != "postgresql":
+        return
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+
+        try:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        except Exception as e:
+            logger.warning(f"Failed to install pg_trgm: {e}")
+
+        result = await conn.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"))
+        _trigram_available = result.scalar() is not None
+
+    if not _trigram_available:
+        logger.warning("pg_trgm not installed, product search runs without fuzzy matching")
+
+    async with index_build_connection() as conn:
+        if conn is None:
+            return
+
+        try:
+            await create_index_concurrently(
+                conn,
+                "ix_products_search_document",
+                f"ON products USING gin (({_index_expression(product_search_document)}))"
+            )
+        except Exception as e:
+            logger.warning(f"Failed to create full-text search index: {e}")
+
+        if _trigram_available:
+            try:
+                await create_index_concurrently(
+                    conn,
+                    "ix_products_search_titles_trgm",
+                    f"ON products USING gin (({_index_expression(product_search_titles)}) gin_trgm_ops)"
+                )
+            except Exception as e:
+                logger.warning(f"Failed to create trigram search index: {e}")
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
+
+def product_search_clauses(q: str):
+    """
+    WHERE clause and rank expression for a product search.
+
+    A product matches on full-text words in any title or description, on a
+    substring of either title (Bangla words often appear inside longer
+    ones), or, with pg_trgm, on a title word close to the query (typos).
+    """
+    ts_query = func.websearch_to_tsquery(literal_column("'simple'::regconfig"), q)
+    conditions = [
+        product_search_document.op("@@")(ts_query),
+        product_search_titles.ilike(f"%{_escape_like(q)}%", escape="/"),
+    ]
+    rank = func.ts_rank(product_search_document, ts_query)
+
+    if _trigram_available:
+        conditions.append(literal(q).op("<%")(product_search_titles))
+        rank = rank + func.word_similarity(q, product_search_titles)
+
+    return or_(*conditions), rank
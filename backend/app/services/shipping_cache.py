@@ -0,0 +1,72 @@
+from typing import Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import TTLCache, MISSING, invalidation_bus
+from app.core.config import settings
+from app.models.shipping import ShippingClass
+from app.schemas.shipping import ShippingClassResponse
+
+
+class ShippingClassCache:
+    """
+    Per-worker cache of each tenant's shipping classes.
+
+    Holds every class of a tenant (active or not) as ShippingClassResponse,
+    in display order, so the storefront list and checkout pricing don't
+    need a query. Anything that creates, changes or deletes a shipping
+    class must call invalidate() after committing.
+    """
+
+    TOPIC = "shipping"
+
+    def __init__(self):
+        self._cache = TTLCache(
+            "shipping_classes",
+            maxsize=settings.SHIPPING_CACHE_MAX_SIZE,
+            ttl=settings.SHIPPING_CACHE_TTL_SECONDS,
+        )
+        # Bumped on invalidation so an in-flight load can't cache stale data
+        self._generation = 0
+        invalidation_bus.subscribe(self.TOPIC, self._on_invalidate)
+
+    async def get(self, tenant_id: int, db: AsyncSession) -> Tuple[ShippingClassResponse, ...]:
+        """Get a tenant's shipping classes, querying the database on a miss"""
+        classes = self._cache.get(tenant_id)
+        if classes is not MISSING:
+            return classes
+
+        generation = self._generation
+        result = await db.execute(
+            select(ShippingClass)
+            .where(ShippingClass.tenant_id == tenant_id)
+            .order_by(ShippingClass.sort_order, ShippingClass.name)
+        )
+        classes = tuple(
+            ShippingClassResponse.model_validate(shipping_class)
+            for shipping_class in result.scalars().all()
+        )
+
+        if generation == self._generation:
+            self._cache.set(tenant_id, classes)
+        return classes
+
+    async def get_active(self, tenant_id: int, shipping_id: int, db: AsyncSession) -> Optional[ShippingClassResponse]:
+        """Get one active shipping class of a tenant, or None"""
+        for shipping_class in await self.get(tenant_id, db):
+            if shipping_class.id == shipping_id and shipping_class.is_active:
+                return shipping_class
+        return None
+
+    async def invalidate(self, tenant_id: int):
+        """Drop a tenant's shipping classes from the cache in every worker"""
+        await invalidation_bus.publish(self.TOPIC, tenant_id)
+
+    def _on_invalidate(self, tenant_id: Optional[int]):
+        self._generation += 1
+        if tenant_id is None:
+            self._cache.clear()
+        else:
+            self._cache.delete(tenant_id)
+
+
+shipping_cache = ShippingClassCache()
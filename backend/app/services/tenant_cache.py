@@ -0,0 +1,190 @@
+from typing import Dict, Optional, Set
+from sqlalchemy import select
+from app.core.cache import TTLCache, MISSING, invalidation_bus, register_stats
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.tenant_context import TenantContext
+from app.models.tenant import Tenant
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TenantCache:
+    """
+    Per-worker cache of active tenants keyed by slug, held as TenantContext.
+
+    Storefront requests resolve their tenant from here, so steady-state
+    traffic never needs a database round trip for it. Entries expire after
+    TENANT_CACHE_TTL_SECONDS and are dropped in every worker as soon as a
+    tenant is changed.
+
+    Unknown subdomains are turned away without a query: the set of active
+    slugs is loaded at startup and refreshed every TENANT_SLUG_REFRESH_SECONDS,
+    and slugs that were just looked up and not found are remembered for
+    TENANT_NEGATIVE_CACHE_TTL_SECONDS.
+    """
+
+    TOPIC = "tenant"
+
+    def __init__(self):
+        self._cache = TTLCache(
+            "tenants",
+            maxsize=settings.TENANT_CACHE_MAX_SIZE,
+            ttl=settings.TENANT_CACHE_TTL_SECONDS,
+        )
+        self._misses = TTLCache(
+            "tenant_misses",
+            maxsize=settings.TENANT_CACHE_MAX_SIZE,
+            ttl=settings.TENANT_NEGATIVE_CACHE_TTL_SECONDS,
+        )
+        # Active slugs; None until loaded, in which case every miss is queried
+        self._known_slugs: Optional[Set[str]] = None
+        # Slugs added while a refresh query is running, so it can't drop them
+        self._added_during_refresh: Set[str] = set()
+        self._rejected = 0
+        # Concurrent misses for the same slug share one query
+        self._loading: Dict[str, asyncio.Future] = {}
+        # Bumped on invalidation so an in-flight load can't cache stale data
+        self._generation = 0
+        self._refresh_task: Optional[asyncio.Task] = None
+        invalidation_bus.subscribe(self.TOPIC, self._on_invalidate)
+        register_stats("tenant_filter", self.filter_stats)
+
+    async def get_by_slug(self, slug: str) -> Optional[TenantContext]:
+        """Get an active tenant by slug, loading it from the database on a miss"""
+        tenant = self._cache.get(slug)
+        if tenant is not MISSING:
+            return tenant
+
+        if self._known_slugs is not None and slug not in self._known_slugs:
+            self._rejected += 1
+            return None
+
+        if self._misses.get(slug) is not MISSING:
+            return None
+
+        pending = self._loading.get(slug)
+        while pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # Only the loading request was cancelled: load it here instead
+                if not pending.cancelled() or asyncio.current_task().cancelling():
+                    raise
+            pending = self._loading.get(slug)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[slug] = future
+        generation = self._generation
+        try:
+            tenant = await self._load(slug)
+
+            if generation == self._generation:
+                if tenant is not None:
+                    self._cache.set(slug, tenant)
+                else:
+                    self._misses.set(slug, True)
+
+            future.set_result(tenant)
+            return tenant
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            del self._loading[slug]
+            # Cancelled (client gone, shutdown); don't leave the waiters hanging
+            if not future.done():
+                future.cancel()
+
+    async def _load(self, slug: str) -> Optional[TenantContext]:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(Tenant).where(
+                    Tenant.slug == slug,
+                    Tenant.is_active == True
+                )
+            )
+            tenant = result.scalar_one_or_none()
+            return TenantContext.from_model(tenant) if tenant else None
+
+    async def load_known_slugs(self):
+        """Load the set of active tenant slugs"""
+        self._added_during_refresh = set()
+
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(Tenant.slug).where(Tenant.is_active == True)
+            )
+            slugs = set(result.scalars().all())
+
+        self._known_slugs = slugs | self._added_during_refresh
+        self._added_during_refresh = set()
+
+    async def start(self):
+        """Load known slugs and keep them refreshed in the background"""
+        try:
+            await self.load_known_slugs()
+        except Exception as e:
+            logger.warning(f"Could not load tenant slugs, falling back to per-request lookups: {e}")
+
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        """Stop the background refresh"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(settings.TENANT_SLUG_REFRESH_SECONDS)
+            try:
+                await self.load_known_slugs()
+            except Exception as e:
+                logger.warning(f"Tenant slug refresh failed: {e}")
+
+    async def invalidate(self, slug: str, is_active: bool = True):
+        """Drop a created or changed tenant from the caches in every worker"""
+        await invalidation_bus.publish(
+            self.TOPIC, {"slug": slug, "is_active": is_active}
+        )
+
+    def _on_invalidate(self, event: Optional[dict]):
+        self._generation += 1
+
+        if event is None:
+            self._cache.clear()
+            self._misses.clear()
+            return
+
+        slug = event["slug"]
+        self._cache.delete(slug)
+        self._misses.delete(slug)
+
+        if event.get("is_active", True):
+            self._added_during_refresh.add(slug)
+            if self._known_slugs is not None:
+                self._known_slugs.add(slug)
+        else:
+            self._added_during_refresh.discard(slug)
+            if self._known_slugs is not None:
+                self._known_slugs.discard(slug)
+
+    def filter_stats(self) -> dict:
+        """Counters for unknown-slug rejection"""
+        return {
+            "known_slugs": len(self._known_slugs) if self._known_slugs is not None else None,
+            "rejected": self._rejected,
+        }
+
+
+tenant_cache = TenantCache()
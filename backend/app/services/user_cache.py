@@ -0,0 +1,55 @@
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import TTLCache, MISSING, invalidation_bus
+from app.core.config import settings
+from app.core.user_context import UserContext
+from app.models.user import User
+
+
+class UserStatusCache:
+    """
+    Short-lived per-worker cache of user status for authentication.
+
+    Users that don't exist are cached too (as None). Anything that changes
+    a user's is_active flag (or deletes the user) must call invalidate() so
+    that every worker sees the change immediately rather than after the TTL.
+    """
+
+    TOPIC = "user"
+
+    def __init__(self):
+        self._cache = TTLCache(
+            "user_status",
+            maxsize=settings.USER_STATUS_CACHE_MAX_SIZE,
+            ttl=settings.USER_STATUS_CACHE_TTL_SECONDS,
+        )
+        invalidation_bus.subscribe(self.TOPIC, self._on_invalidate)
+
+    async def get(self, user_id: int, db: AsyncSession) -> Optional[UserContext]:
+        """Get a user's status, querying the database on a miss"""
+        user = self._cache.get(user_id)
+        if user is not MISSING:
+            return user
+
+        result = await db.execute(
+            select(User).where(User.id == user_id)
+        )
+        row = result.scalar_one_or_none()
+        user = UserContext.from_model(row) if row else None
+
+        self._cache.set(user_id, user)
+        return user
+
+    async def invalidate(self, user_id: int):
+        """Drop a user from the cache in every worker"""
+        await invalidation_bus.publish(self.TOPIC, user_id)
+
+    def _on_invalidate(self, user_id: Optional[int]):
+        if user_id is None:
+            self._cache.clear()
+        else:
+            self._cache.delete(user_id)
+
+
+user_status_cache = UserStatusCache()
@@ -0,0 +1,210 @@
+from sqlalchemy import select, update, func
+from sqlalchemy.orm import selectinload
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.tenant_context import TenantContext
+from app.models.order import Order
+from app.models.outbox import OutboxEvent, OutboxStatus
+from app.models.tenant import Tenant
+from app.services.order_notifications import send_outbox_event
+from collections import defaultdict
+from datetime import timedelta
+import asyncio
+import logging
+import random
+import signal
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxWorker:
+    """
+    Drains the outbox table.
+    
+    Due rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so several
+    workers can run side by side without sending anything twice. A claim
+    pushes available_at out by LEASE_SECONDS and commits straight away: no
+    transaction stays open while a send is in progress, and rows of a
+    worker that dies are picked up again once the lease runs out.
+    
+    Sends run concurrently, at most OUTBOX_CHANNEL_CONCURRENCY at a time per
+    channel, so a slow SMTP server doesn't hold up WhatsApp or pixel events.
+    Failures are retried with exponential backoff until OUTBOX_MAX_ATTEMPTS.
+    """
+    
+    LEASE_SECONDS = 300
+    BACKOFF_BASE_SECONDS = 30
+    MAX_BACKOFF_SECONDS = 3600
+    
+    def __init__(self):
+        self._semaphores = defaultdict(
+            lambda: asyncio.Semaphore(settings.OUTBOX_CHANNEL_CONCURRENCY)
+        )
+        self._in_flight = set()
+        self._stopping = asyncio.Event()
+    
+    def stop(self):
+        """Stop claiming new rows; run() returns once in-flight sends finish"""
+        self._stopping.set()
+    
+    async def run(self):
+        logger.info("Outbox worker started")
+        
+        while not self._stopping.is_set():
+            capacity = settings.OUTBOX_BATCH_SIZE - len(self._in_flight)
+            claimed = []
+            
+            if capacity > 0:
+                try:
+                    claimed = await self.claim(capacity)
+                except Exception as e:
+                    logger.error(f"Failed to claim outbox events: {e}")
+                
+                for event in claimed:
+                    task = asyncio.create_task(self.deliver(*event))
+                    self._in_flight.add(task)
+                    task.add_done_callback(self._in_flight.discard)
+            
+            # A full batch means there is probably more waiting
+            if claimed and len(claimed) == capacity:
+                continue
+            
+            await self._idle()
+        
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        logger.info("Outbox worker stopped")
+    
+    async def _idle(self):
+        """Sleep until the next poll, a send finishing (if at capacity) or stop()"""
+        waiters = [asyncio.ensure_future(self._stopping.wait())]
+        if len(self._in_flight) >= settings.OUTBOX_BATCH_SIZE:
+            waiters.extend(self._in_flight)
+        
+        await asyncio.wait(
+            waiters,
+            timeout=settings.OUTBOX_POLL_SECONDS,
+            return_when=asyncio.FIRST_COMPLETED
+        )
+        waiters[0].cancel()
+    
+    async def claim(self, limit: int):
+        """Lease up to limit due rows; returns (event id, channel, payload, attempts, tenant, order) tuples"""
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(OutboxEvent)
+                .where(
+                    OutboxEvent.status == OutboxStatus.PENDING,
+                    OutboxEvent.available_at <= func.now()
+                )
+                .order_by(OutboxEvent.available_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            events = result.scalars().all()
+            if not events:
+                return []
+            
+            await session.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id.in_([event.id for event in events]))
+                .values(
+                    available_at=func.now() + timedelta(seconds=self.LEASE_SECONDS),
+                    attempts=OutboxEvent.attempts + 1
+                )
+                .execution_options(synchronize_session=False)
+            )
+            
+            # Everything the senders need, loaded once for the whole batch
+            result = await session.execute(
+                select(Order)
+                .options(selectinload(Order.items))
+                .where(Order.id.in_({event.order_id for event in events}))
+            )
+            orders = {order.id: order for order in result.scalars().all()}
+            
+            result = await session.execute(
+                select(Tenant).where(Tenant.id.in_({event.tenant_id for event in events}))
+            )
+            tenants = {tenant.id: TenantContext.from_model(tenant) for tenant in result.scalars().all()}
+            
+            await session.commit()
+        
+        return [
+            (
+                event.id,
+                event.channel,
+                event.payload or {},
+                event.attempts + 1,
+                tenants.get(event.tenant_id),
+                orders.get(event.order_id),
+            )
+            for event in events
+        ]
+    
+    async def deliver(self, event_id: int, channel: str, payload: dict, attempts: int, tenant, order):
+        """Send one event and record the outcome"""
+        error = None
+        
+        if tenant is None or order is None:
+            # Nothing to send any more; don't retry
+            await self.record(event_id, attempts, "tenant or order no longer exists", final=True)
+            return
+        
+        async with self._semaphores[channel]:
+            try:
+                if not await send_outbox_event(channel, tenant, order, payload):
+                    error = f"{channel} send failed"
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+        
+        if error:
+            logger.warning(f"Outbox event {event_id} attempt {attempts} failed: {error}")
+        
+        try:
+            await self.record(event_id, attempts, error)
+        except Exception as e:
+            # The lease runs out and the event is retried
+            logger.error(f"Failed to record outbox event {event_id}: {e}")
+    
+    async def record(self, event_id: int, attempts: int, error=None, final: bool = False):
+        """Mark an event sent, schedule a retry, or give up on it"""
+        if error is None:
+            values = {"status": OutboxStatus.SENT, "sent_at": func.now(), "last_error": None}
+        elif final or attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            values = {"status": OutboxStatus.FAILED, "last_error": error}
+            logger.error(f"Outbox event {event_id} failed permanently: {error}")
+        else:
+            values = {
+                "available_at": func.now() + timedelta(seconds=self.backoff(attempts)),
+                "last_error": error
+            }
+        
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id == event_id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+    
+    def backoff(self, attempts: int) -> float:
+        """Exponential backoff with jitter, so failed sends don't retry in lockstep"""
+        delay = min(self.BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), self.MAX_BACKOFF_SECONDS)
+        return delay * random.uniform(0.8, 1.2)
+
+
+async def main():
+    worker = OutboxWorker()
+    
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    
+    await worker.run()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(main())
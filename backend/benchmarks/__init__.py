@@ -0,0 +1,5 @@
+import os
+
+# The app reads its settings on import, and every benchmark runs as one
+# process; set here so it applies whatever a benchmark imports first
+os.environ.setdefault("ORDER_NUMBER_WORKER_ID", "0")
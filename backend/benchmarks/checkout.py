@@ -0,0 +1,69 @@
+"""
+Checkout latency by cart size.
+
+Places --orders orders through POST /orders for each cart size, one at a
+time, each cart holding that many distinct products of the store. The
+checkout loads the cart's products and reserves their stock in a fixed
+number of statements, so latency should grow far slower than the cart;
+the per-item column makes that visible.
+
+    python -m benchmarks.checkout --orders 300 --cart-sizes 1 5 10 20
+"""
+import argparse
+import asyncio
+import random
+
+from benchmarks.common import Timer, create_store, product_ids, running_app
+
+
+def checkout_body(cart):
+    return {
+        "customer_name": "রহিম উদ্দিন",
+        "customer_phone": "01711111111",
+        "customer_address": "House 1, Road 2, Dhanmondi, Dhaka",
+        "items": [{"product_id": product_id, "quantity": 1} for product_id in cart],
+    }
+
+
+async def main(args):
+    rng = random.Random(args.seed)
+    catalog_size = max(args.cart_sizes) * 5
+
+    async with running_app() as client:
+        store = await create_store([
+            {
+                "title": f"Product {i}",
+                "slug": f"product-{i}",
+                "price": 100 + i,
+                # Never runs out, whatever the run
+                "stock_quantity": args.orders * (len(args.cart_sizes) + 1),
+            }
+            for i in range(catalog_size)
+        ])
+        headers = {"Host": store.headers["Host"]}
+        products = await product_ids(store)
+
+        async def place(size: int, timer: Timer):
+            body = checkout_body(rng.sample(products, size))
+            async with timer.measure():
+                response = await client.post("/api/v1/orders", json=body, headers=headers)
+            if response.status_code != 201:
+                raise RuntimeError(f"Checkout answered {response.status_code}: {response.text}")
+
+        # Warm the per-worker caches and the connection pool
+        for _ in range(min(args.orders, 20)):
+            await place(max(args.cart_sizes), Timer())
+
+        for size in args.cart_sizes:
+            timer = Timer()
+            for _ in range(args.orders):
+                await place(size, timer)
+            print(f"{size:>3} items: {timer.summary()} ({timer.percentile(50) / size:.2f}ms per item at p50)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=300, help="orders per cart size")
+    parser.add_argument("--cart-sizes", type=int, nargs="+", default=[1, 5, 10, 20])
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,120 @@
+"""
+Streamed order export of a large store under a fixed memory ceiling.
+
+Fills a store with --orders synthetic orders of one to three items each,
+then downloads GET /orders/export in the requested format, reading the
+body as it streams. It reports time to first byte, throughput and how
+far the process RSS grew over its level before the download; the export
+streams from a server-side cursor, so the growth must not depend on the
+store's size. Exits non-zero above --max-rss-growth-mb.
+
+    python -m benchmarks.order_export --orders 1000000 --format ndjson
+"""
+import argparse
+import asyncio
+import gc
+import random
+import resource
+import sys
+import time
+
+from sqlalchemy import insert
+
+from app.core.database import AsyncSessionLocal
+from app.models import Order, OrderItem
+from benchmarks.common import create_store, product_ids, running_app, stream_get
+
+# Orders per INSERT ... RETURNING while filling the store
+FILL_BATCH_SIZE = 5000
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process"""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Not Linux: only the peak is available, which still catches growth
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+async def fill_orders(tenant_id: int, product_id: int, count: int, rng: random.Random):
+    for start in range(0, count, FILL_BATCH_SIZE):
+        size = min(FILL_BATCH_SIZE, count - start)
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                insert(Order).returning(Order.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "tenant_id": tenant_id,
+                        "order_number": f"BENCH-{tenant_id}-{start + i}",
+                        "customer_name": "রহিম উদ্দিন",
+                        "customer_phone": f"017{rng.randrange(10**8):08d}",
+                        "customer_address": "House 1, Road 2, Dhanmondi, Dhaka",
+                        "subtotal": 1000,
+                        "shipping_cost": 60,
+                        "total": 1060,
+                    }
+                    for i in range(size)
+                ]
+            )
+            items = [
+                {
+                    "order_id": order_id,
+                    "product_id": product_id,
+                    "product_title": "জামদানি শাড়ি",
+                    "product_price": 500,
+                    "quantity": 1,
+                    "subtotal": 500,
+                }
+                for order_id in result.scalars().all()
+                for _ in range(rng.randint(1, 3))
+            ]
+            await session.execute(insert(OrderItem), items)
+            await session.commit()
+        print(f"\r{start + size}/{count} orders", end="", file=sys.stderr)
+    print(file=sys.stderr)
+
+
+async def main(args):
+    rng = random.Random(args.seed)
+
+    async with running_app():
+        store = await create_store([{"title": "Jamdani Saree", "slug": "jamdani-saree", "price": 500}])
+        await fill_orders(store.tenant_id, (await product_ids(store))[0], args.orders, rng)
+
+        gc.collect()
+        baseline = peak = rss_mb()
+        received = 0
+        first_byte = None
+        started = time.perf_counter()
+
+        async for chunk in stream_get("/api/v1/orders/export", store.headers, f"format={args.format}"):
+            if first_byte is None:
+                first_byte = time.perf_counter() - started
+            received += len(chunk)
+            peak = max(peak, rss_mb())
+
+        elapsed = time.perf_counter() - started
+
+    growth = peak - baseline
+    print(
+        f"{args.orders} orders as {args.format}: {received / 2**20:.0f} MiB in {elapsed:.1f}s "
+        f"({args.orders / elapsed:.0f} orders/s), first byte after {first_byte * 1000:.0f}ms, "
+        f"RSS {baseline:.0f} MiB -> peak {peak:.0f} MiB (+{growth:.1f} MiB)"
+    )
+    if growth > args.max_rss_growth_mb:
+        sys.exit(f"RSS grew by more than {args.max_rss_growth_mb} MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--format", choices=["csv", "ndjson"], default="csv")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=64)
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,94 @@
+"""
+GET /products/search latency on a large synthetic catalog (Postgres only).
+
+Fills --stores stores with --products products each, titles and
+descriptions mixing English and Bangla words, then runs a mix of word,
+Bangla substring, typo and description queries against the first store.
+The response cache is cleared before every request, so each one runs
+the search query. Exits non-zero when p95 is above --target-p95-ms.
+
+    python -m benchmarks.product_search --products 100000 --target-p95-ms 150
+"""
+import argparse
+import asyncio
+import random
+import sys
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.services.catalog import catalog_responses
+from benchmarks.common import Timer, create_store, running_app
+
+ENGLISH = [
+    "cotton", "silk", "saree", "panjabi", "kurti", "wallet", "leather", "shoes", "sandal", "bag",
+    "lamp", "mug", "honey", "tea", "rice", "mango", "scarf", "shirt", "jacket", "watch",
+]
+BANGLA = [
+    "জামদানি", "শাড়ি", "পাঞ্জাবি", "সুতি", "রেশম", "চামড়া", "ব্যাগ", "জুতা", "মধু", "চা",
+    "আম", "চাদর", "শার্ট", "ঘড়ি", "বাতি", "কাপ", "চাল", "গামছা", "লুঙ্গি", "নকশি",
+]
+
+QUERIES = [
+    "saree", "cotton panjabi", "leather wallet", "honey",  # English words
+    "জামদানি", "সুতি পাঞ্জাবি",  # Bangla words
+    "দানি", "ঞ্জাব",  # Bangla substrings
+    "panjbi", "jakcet", "sarre",  # typos
+    "handmade",  # description only
+]
+
+
+def synthetic_products(count: int, rng: random.Random):
+    for i in range(count):
+        english = rng.sample(ENGLISH, 3)
+        bangla = rng.sample(BANGLA, 3)
+        yield {
+            "title": f"{english[0].title()} {english[1]} {i}",
+            "title_bn": " ".join(bangla[:2]),
+            "description": f"{english[2]} {'handmade ' if i % 50 == 0 else ''}from Bangladesh",
+            "description_bn": bangla[2],
+            "slug": f"product-{i}",
+            "price": rng.randint(50, 5000),
+            "stock_quantity": rng.randint(0, 100),
+        }
+
+
+async def main(args):
+    if engine.dialect.name != "postgresql":
+        sys.exit("Search needs Postgres: point DATABASE_URL at a scratch Postgres database")
+
+    rng = random.Random(args.seed)
+    timer = Timer()
+
+    async with running_app() as client:
+        stores = []
+        for _ in range(args.stores):
+            stores.append(await create_store(list(synthetic_products(args.products, rng))))
+        async with engine.connect() as conn:
+            await conn.execute(text("ANALYZE products"))
+
+        store = stores[0]
+        for round_number in range(args.rounds):
+            for q in QUERIES:
+                catalog_responses._cache.clear()
+                async with timer.measure():
+                    response = await client.get(
+                        "/api/v1/products/search", params={"q": q, "limit": 20}, headers=store.headers
+                    )
+                response.raise_for_status()
+                if round_number == 0:
+                    print(f"{q!r}: {len(response.json())} results")
+
+    print(f"{args.products} products x {args.stores} stores: {timer.summary()}")
+    if timer.percentile(95) > args.target_p95_ms:
+        sys.exit(f"p95 is above the {args.target_p95_ms}ms target")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=100000, help="products per store")
+    parser.add_argument("--stores", type=int, default=2, help="stores, searched in the first one only")
+    parser.add_argument("--rounds", type=int, default=20, help="times every query is run")
+    parser.add_argument("--target-p95-ms", type=float, default=150)
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(main(parser.parse_args()))
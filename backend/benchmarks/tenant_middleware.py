@@ -0,0 +1,123 @@
+"""
+Requests per second on GET /products with the tenant middleware as plain
+ASGI middleware versus the same logic on BaseHTTPMiddleware.
+
+Both variants resolve the tenant through the same per-worker cache, so
+the difference is only what BaseHTTPMiddleware adds per request: the
+Request wrapper, the task group around call_next and the memory stream
+the response body is copied through. The variants take turns over
+--rounds rounds so drift in the machine affects both alike.
+
+    python -m benchmarks.tenant_middleware --requests 2000 --concurrency 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.main import app
+from app.middleware.tenant import TenantMiddleware
+from app.services.tenant_cache import tenant_cache
+from benchmarks.common import Timer, create_store, running_app
+
+
+class BaseHTTPTenantMiddleware(BaseHTTPMiddleware):
+    """TenantMiddleware as it was written before, on BaseHTTPMiddleware"""
+
+    async def dispatch(self, request: Request, call_next):
+        path = request.url.path
+        if path.startswith("/health") or path.startswith("/static") or path.startswith("/api/v1/health"):
+            return await call_next(request)
+
+        parts = request.headers.get("host", "").split(":")[0].split(".")
+        tenant_slug = None
+        if len(parts) >= 3:
+            tenant_slug = parts[0]
+            if tenant_slug in ["www", "api", "app", "admin"]:
+                tenant_slug = None
+
+        tenant = None
+        if tenant_slug:
+            tenant = await tenant_cache.get_by_slug(tenant_slug)
+            if not tenant and not path.startswith("/api"):
+                return JSONResponse(status_code=404, content={"detail": "Store not found"})
+
+        request.state.tenant = tenant
+        request.state.tenant_slug = tenant_slug
+        return await call_next(request)
+
+
+VARIANTS = {
+    "asgi": TenantMiddleware,
+    "base_http": BaseHTTPTenantMiddleware,
+}
+
+
+def use_tenant_middleware(middleware_class):
+    """Swap the tenant middleware in the app's stack"""
+    for index, middleware in enumerate(app.user_middleware):
+        if middleware.cls in VARIANTS.values():
+            app.user_middleware[index] = Middleware(middleware_class)
+    # Starlette builds the stack again on the next request
+    app.middleware_stack = None
+
+
+async def run_round(client, headers, requests: int, concurrency: int, timer: Timer) -> float:
+    """Requests per second over one round"""
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            async with timer.measure():
+                response = await client.get("/api/v1/products", headers=headers)
+            if response.status_code != 200:
+                raise RuntimeError(f"GET /api/v1/products answered {response.status_code}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - started)
+
+
+async def main(args):
+    async with running_app() as client:
+        store = await create_store([
+            {"title": f"Product {i}", "slug": f"product-{i}", "price": 100 + i, "stock_quantity": 10}
+            for i in range(args.products)
+        ])
+        # The public listing needs no token
+        headers = {"Host": store.headers["Host"]}
+
+        throughput = {name: [] for name in VARIANTS}
+        timers = {name: Timer() for name in VARIANTS}
+        try:
+            for name, middleware_class in VARIANTS.items():
+                use_tenant_middleware(middleware_class)
+                await run_round(client, headers, args.concurrency * 10, args.concurrency, Timer())
+
+            for _ in range(args.rounds):
+                for name, middleware_class in VARIANTS.items():
+                    use_tenant_middleware(middleware_class)
+                    throughput[name].append(
+                        await run_round(client, headers, args.requests, args.concurrency, timers[name])
+                    )
+        finally:
+            use_tenant_middleware(TenantMiddleware)
+
+    for name in VARIANTS:
+        print(f"{name:>9}: {statistics.median(throughput[name]):.0f} req/s (median of {args.rounds}), {timers[name].summary()}")
+    speedup = statistics.median(throughput["asgi"]) / statistics.median(throughput["base_http"])
+    print(f"plain ASGI serves {speedup:.2f}x the requests of BaseHTTPMiddleware")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per round and variant")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--products", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,104 @@
+import os
+import tempfile
+
+# The app reads its settings on import. Tests run against TEST_DATABASE_URL
+# (use Postgres for anything that depends on row locks) or a throwaway
+# SQLite file, without Redis so every cache stays in-process.
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL") or (
+    f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/test.db"
+)
+os.environ["ENVIRONMENT"] = "test"
+os.environ["REDIS_URL"] = ""
+os.environ["ORDER_NUMBER_WORKER_ID"] = "1"
+
+import asyncio
+import itertools
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.database import engine, AsyncSessionLocal, Base
+from app.core.security import create_access_token
+from app.main import app
+from app.models import Product, Tenant, User
+from app.services.tenant_cache import tenant_cache
+
+_store_numbers = itertools.count(1)
+
+
+@dataclass
+class Store:
+    tenant_id: int
+    slug: str
+    owner_id: int
+    product_ids: List[int] = field(default_factory=list)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Headers addressing this store's subdomain, as its owner"""
+        token = create_access_token({"sub": str(self.owner_id), "user_id": self.owner_id})
+        return {"Host": f"{self.slug}.example.com", "Authorization": f"Bearer {token}"}
+
+
+async def _reset_database():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest.fixture(scope="session")
+def client():
+    asyncio.run(_reset_database())
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def store_factory(client):
+    """Creates new stores with five products (stock 20 each)"""
+
+    async def create() -> Store:
+        number = next(_store_numbers)
+
+        async with AsyncSessionLocal() as session:
+            owner = User(phone=f"0170000{number:04d}", is_active=True)
+            session.add(owner)
+            await session.flush()
+
+            tenant = Tenant(slug=f"store{number}", name=f"Store {number}", owner_id=owner.id)
+            session.add(tenant)
+            await session.flush()
+
+            products = [
+                Product(tenant_id=tenant.id, title=f"Product {i}", slug=f"product-{i}", price=100 + i, stock_quantity=20)
+                for i in range(5)
+            ]
+            session.add_all(products)
+            await session.commit()
+
+        # Let the tenant middleware see the new subdomain
+        await tenant_cache.load_known_slugs()
+        return Store(tenant.id, tenant.slug, owner.id, [product.id for product in products])
+
+    return lambda: client.portal.call(create)
+
+
+@pytest.fixture
+def store(store_factory) -> Store:
+    """A new store with five products (stock 20 each)"""
+    return store_factory()
+
+
+@pytest.fixture
+def statements():
+    """SQL statements sent to the database during the test, in order"""
+    recorded = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield recorded
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
@@ -0,0 +1,69 @@
+import itertools
+
+import pytest
+
+from app.api.v1 import auth
+from app.core.config import settings
+
+_phones = (f"0181{number:07d}" for number in itertools.count(1))
+
+
+@pytest.fixture
+def phone(monkeypatch):
+    """A phone number no code was issued for yet; its next code is 123456"""
+    monkeypatch.setattr(auth.secrets, "randbelow", lambda _: 123456)
+    return next(_phones)
+
+
+def request_otp(client, phone):
+    return client.post("/api/v1/auth/otp/request", json={"phone": phone})
+
+
+def verify_otp(client, phone, otp):
+    return client.post("/api/v1/auth/otp/verify", json={"phone": phone, "otp": otp})
+
+
+def test_a_valid_code_logs_in_once(client, phone):
+    assert request_otp(client, phone).status_code == 200
+
+    response = verify_otp(client, phone, "123456")
+    assert response.status_code == 200
+    assert response.json()["access_token"]
+
+    assert verify_otp(client, phone, "123456").status_code == 401
+
+
+def test_a_wrong_code_is_rejected(client, phone):
+    request_otp(client, phone)
+
+    assert verify_otp(client, phone, "654321").status_code == 401
+    # The right code still works afterwards
+    assert verify_otp(client, phone, "123456").status_code == 200
+
+
+def test_too_many_attempts_burn_the_code(client, phone):
+    request_otp(client, phone)
+
+    for _ in range(settings.OTP_MAX_ATTEMPTS):
+        assert verify_otp(client, phone, "000000").status_code == 401
+
+    assert verify_otp(client, phone, "000000").status_code == 429
+    assert verify_otp(client, phone, "123456").status_code == 401
+
+
+def test_resend_waits_for_the_cooldown(client, phone):
+    assert request_otp(client, phone).status_code == 200
+
+    response = request_otp(client, phone)
+
+    assert response.status_code == 429
+    assert 0 < int(response.headers["Retry-After"]) <= settings.OTP_RESEND_COOLDOWN_SECONDS
+
+
+def test_the_code_is_only_echoed_in_development(client, phone, monkeypatch):
+    monkeypatch.setattr(settings, "DEBUG", False)
+    monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+    assert "otp" not in request_otp(client, phone).json()
+
+    monkeypatch.setattr(settings, "ENVIRONMENT", "development")
+    assert request_otp(client, next(_phones)).json()["otp"] == "123456"
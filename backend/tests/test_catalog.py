@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.services.catalog import CatalogVersions, catalog_responses
+
+
+def test_undeclared_query_parameters_share_the_cached_response(client, store, statements):
+    first = client.get("/api/v1/products/page?limit=2", headers=store.headers)
+    entries = len(catalog_responses._cache)
+
+    statements.clear()
+    responses = [
+        client.get(url, headers=store.headers)
+        for url in ["/api/v1/products/page?limit=2&x=1", "/api/v1/products/page?x=2&limit=02"]
+    ]
+
+    assert all(response.status_code == 200 for response in responses)
+    assert {response.headers["ETag"] for response in responses} == {first.headers["ETag"]}
+    assert len(catalog_responses._cache) == entries
+    # Served from the response cache
+    assert statements == []
+
+
+def test_declared_parameters_change_the_etag(client, store):
+    first = client.get("/api/v1/products/page", params={"limit": 2}, headers=store.headers)
+    second = client.get("/api/v1/products/page", params={"limit": 3}, headers=store.headers)
+
+    assert first.headers["ETag"] != second.headers["ETag"]
+
+
+def test_conditional_request_gets_304(client, store):
+    etag = client.get(f"/api/v1/products/{store.product_ids[0]}", headers=store.headers).headers["ETag"]
+
+    response = client.get(
+        f"/api/v1/products/{store.product_ids[0]}",
+        headers={**store.headers, "If-None-Match": etag}
+    )
+
+    assert response.status_code == 304
+
+
+def test_cache_is_bounded_by_total_bytes():
+    cache = TTLCache("test_bytes", maxsize=100, ttl=60, maxbytes=10)
+
+    cache.set("a", b"1234")
+    cache.set("b", b"1234")
+    cache.set("c", b"1234")
+    cache.set("huge", b"12345678901")
+
+    assert cache.get("a", None) is None
+    assert cache.get("b") == cache.get("c") == b"1234"
+    assert cache.get("huge", None) is None
+    assert cache.bytes == 8
+
+    cache.set("b", b"12")
+    cache.delete("c")
+    assert cache.bytes == 2
+
+
+def test_version_without_redis_only_changes_on_a_bump(monkeypatch):
+    versions = CatalogVersions()
+    now = time.monotonic()
+
+    async def scenario():
+        first = await versions.get(1)
+        # Well past the TTL, with no write in between
+        monkeypatch.setattr(time, "monotonic", lambda: now + settings.CATALOG_VERSION_TTL_SECONDS * 10)
+        assert await versions.get(1) == first
+
+        await versions.bump(1)
+        bumped = await versions.get(1)
+        assert bumped.tag != first.tag
+        assert bumped.modified > first.modified
+
+    asyncio.run(scenario())
@@ -0,0 +1,29 @@
+from app.core.database import AsyncSessionLocal
+from app.core.security import create_access_token
+from app.models import User
+
+
+def bearer(user_id):
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id), 'user_id': user_id})}"}
+
+
+def test_stats_are_for_superusers_only(client, store):
+    async def create_superuser():
+        async with AsyncSessionLocal() as session:
+            user = User(phone="01999999999", is_active=True, is_superuser=True)
+            session.add(user)
+            await session.commit()
+            return user.id
+
+    superuser_id = client.portal.call(create_superuser)
+
+    assert client.get("/api/v1/health/stats").status_code == 401
+    assert client.get("/api/v1/health/stats", headers=bearer(store.owner_id)).status_code == 403
+
+    response = client.get("/api/v1/health/stats", headers=bearer(superuser_id))
+    assert response.status_code == 200
+    assert "tenants" in response.json()
+
+
+def test_health_check_stays_public(client):
+    assert client.get("/api/v1/health").status_code == 200
@@ -0,0 +1,104 @@
+import pytest
+from sqlalchemy import select, update
+
+from app.core.database import engine, AsyncSessionLocal
+from app.models import Order
+from app.models.order import OrderStatus
+from tests.test_orders import place_orders
+
+postgres_only = pytest.mark.skipif(
+    engine.dialect.name != "postgresql", reason="Binds the order ids as a Postgres array"
+)
+
+
+def set_status(client, order_ids, status):
+    async def store_status():
+        async with AsyncSessionLocal() as session:
+            await session.execute(update(Order).where(Order.id.in_(order_ids)).values(status=status))
+            await session.commit()
+
+    client.portal.call(store_status)
+
+
+def statuses_of(client, order_ids):
+    async def load():
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(Order.id, Order.status).where(Order.id.in_(order_ids)))
+            return {order_id: status.value for order_id, status in result.all()}
+
+    return client.portal.call(load)
+
+
+def bulk_status(client, store, **body):
+    return client.post("/api/v1/orders/bulk-status", json=body, headers=store.headers)
+
+
+@postgres_only
+def test_each_id_gets_a_result(client, store, store_factory):
+    pending, confirmed, delivered = place_orders(client, store, 3)
+    set_status(client, [confirmed], OrderStatus.CONFIRMED)
+    set_status(client, [delivered], OrderStatus.DELIVERED)
+    other_store_order = place_orders(client, store_factory(), 1)[0]
+
+    response = bulk_status(
+        client, store, status="confirmed", order_ids=[pending, confirmed, delivered, other_store_order, 999999]
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["updated"] == 1
+    assert {result["order_id"]: (result["result"], result["status"]) for result in body["results"]} == {
+        pending: ("updated", "confirmed"),
+        confirmed: ("unchanged", "confirmed"),
+        delivered: ("invalid_transition", "delivered"),
+        other_store_order: ("not_found", None),
+        999999: ("not_found", None),
+    }
+    assert statuses_of(client, [pending, other_store_order]) == {pending: "confirmed", other_store_order: "pending"}
+
+
+@postgres_only
+def test_from_status_moves_every_matching_order_of_the_store_only(client, store, store_factory):
+    pending = place_orders(client, store, 3)
+    set_status(client, pending[:1], OrderStatus.CONFIRMED)
+    other_store_orders = place_orders(client, store_factory(), 2)
+
+    response = bulk_status(client, store, status="cancelled", from_status="pending")
+
+    assert response.status_code == 200
+    assert response.json()["updated"] == 2
+    assert statuses_of(client, pending + other_store_orders) == {
+        pending[0]: "confirmed",
+        pending[1]: "cancelled",
+        pending[2]: "cancelled",
+        **{order_id: "pending" for order_id in other_store_orders},
+    }
+
+
+@postgres_only
+def test_order_ids_and_from_status_together(client, store):
+    first, second = place_orders(client, store, 2)
+    set_status(client, [second], OrderStatus.CONFIRMED)
+
+    response = bulk_status(client, store, status="cancelled", from_status="confirmed", order_ids=[first, second])
+
+    assert response.json()["updated"] == 1
+    assert statuses_of(client, [first, second]) == {first: "pending", second: "cancelled"}
+
+
+def test_rejects_requests_that_select_nothing_or_cannot_apply(client, store):
+    assert bulk_status(client, store, status="confirmed").status_code == 400
+    assert bulk_status(client, store, status="confirmed", from_status="delivered").status_code == 400
+    assert bulk_status(client, store, status="pending", from_status="confirmed").status_code == 400
+
+
+def test_only_the_owner_may_change_statuses(client, store, store_factory):
+    other = store_factory()
+
+    response = client.post(
+        "/api/v1/orders/bulk-status",
+        json={"status": "confirmed", "from_status": "pending"},
+        headers={**store.headers, "Authorization": other.headers["Authorization"]}
+    )
+
+    assert response.status_code == 403
@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+
+from app.services import order_export
+from tests.test_orders import order_body, place_orders
+
+
+def test_csv_export_escapes_formulas_in_checkout_fields(client, store):
+    cart = {
+        **order_body((store.product_ids[0], 1)),
+        "customer_name": "=cmd|' /C calc'!A0",
+        "customer_phone": '=HYPERLINK("x")',
+        "payment_method": "@SUM(1+1)",
+    }
+    assert client.post("/api/v1/orders", json=cart, headers=store.headers).status_code == 201
+
+    response = client.get("/api/v1/orders/export?format=csv", headers=store.headers)
+
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.content.decode("utf-8-sig"))))
+    assert len(rows) == 1
+    assert rows[0]["customer_name"] == "'=cmd|' /C calc'!A0"
+    assert rows[0]["customer_phone"] == "'=HYPERLINK(\"x\")"
+    assert rows[0]["payment_method"] == "'@SUM(1+1)"
+
+
+def test_ndjson_keeps_items_together_across_cursor_batches(client, store, monkeypatch):
+    order_ids = place_orders(client, store, 10)
+    # Two items per order and three rows per batch: most orders straddle a batch
+    monkeypatch.setattr(order_export, "EXPORT_BATCH_SIZE", 3)
+
+    with client.stream("GET", "/api/v1/orders/export?format=ndjson", headers=store.headers) as response:
+        assert response.status_code == 200
+        chunks = list(response.iter_text())
+
+    orders = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert [order["id"] for order in orders] == order_ids
+    assert all(len(order["items"]) == 2 for order in orders)
+    assert all(
+        {item["product_id"] for item in order["items"]} == {store.product_ids[i % 5], store.product_ids[(i + 1) % 5]}
+        for i, order in enumerate(orders)
+    )
+
+
+def test_csv_export_streams_every_item_across_cursor_batches(client, store, monkeypatch):
+    place_orders(client, store, 10)
+    monkeypatch.setattr(order_export, "EXPORT_BATCH_SIZE", 3)
+
+    response = client.get("/api/v1/orders/export?format=csv", headers=store.headers)
+
+    rows = list(csv.DictReader(io.StringIO(response.content.decode("utf-8-sig"))))
+    assert len(rows) == 20
+    assert len({row["order_number"] for row in rows}) == 10
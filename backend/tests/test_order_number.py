@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from app.services.order_number import OrderNumbersUnavailable, SnowflakeOrderNumberGenerator
+
+
+def test_refuses_to_start_without_a_worker_id(client):
+    # The test app runs without Redis, so there is no lease to fall back on
+    generator = SnowflakeOrderNumberGenerator()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(generator.start())
+
+
+def test_rejects_worker_ids_that_do_not_fit():
+    with pytest.raises(ValueError):
+        SnowflakeOrderNumberGenerator(SnowflakeOrderNumberGenerator.MAX_WORKERS)
+
+
+def test_numbers_are_unique_and_sorted():
+    generator = SnowflakeOrderNumberGenerator(7)
+
+    numbers = [generator.next() for _ in range(10000)]
+
+    assert len(set(numbers)) == len(numbers)
+    assert numbers == sorted(numbers)
+
+
+def test_workers_never_collide():
+    first, second = SnowflakeOrderNumberGenerator(1), SnowflakeOrderNumberGenerator(2)
+
+    assert not {first.next() for _ in range(1000)} & {second.next() for _ in range(1000)}
+
+
+class LeaseRedis:
+    """The few Redis commands the worker id lease uses, with its renew script"""
+
+    def __init__(self):
+        self.values = {}
+        self.reachable = True
+
+    async def set(self, key, value, nx=False, ex=None):
+        if not self.reachable:
+            raise ConnectionError("redis is unreachable")
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+    def register_script(self, script):
+        async def renew(keys, args):
+            if not self.reachable:
+                raise ConnectionError("redis is unreachable")
+            return 1 if self.values.get(keys[0]) == args[0] else 0
+
+        return renew
+
+
+def leased_generator(monkeypatch):
+    redis = LeaseRedis()
+    monkeypatch.setattr("app.services.order_number.get_redis", lambda: redis)
+    generator = SnowflakeOrderNumberGenerator()
+    generator.LEASE_SECONDS = 0.6
+    return generator, redis
+
+
+def test_a_lease_taken_over_stops_numbers_until_a_new_id_is_leased(monkeypatch):
+    generator, redis = leased_generator(monkeypatch)
+
+    async def scenario():
+        await generator.start()
+        first_id = generator.worker_id
+        generator.next()
+
+        redis.values[generator._lease_key(first_id)] = "another process"
+        await asyncio.sleep(0.3)
+        # The renewal saw the other owner and did not overwrite its lease
+        assert redis.values[generator._lease_key(first_id)] == "another process"
+        with pytest.raises(OrderNumbersUnavailable):
+            generator.next()
+
+        await asyncio.sleep(0.2)
+        assert generator.worker_id not in (None, first_id)
+        generator.next()
+        await generator.stop()
+
+    asyncio.run(scenario())
+
+
+def test_numbers_stop_when_the_lease_cannot_be_renewed_in_time(monkeypatch):
+    generator, redis = leased_generator(monkeypatch)
+
+    async def scenario():
+        await generator.start()
+        redis.reachable = False
+
+        await asyncio.sleep(0.3)
+        generator.next()
+
+        await asyncio.sleep(0.35)
+        with pytest.raises(OrderNumbersUnavailable):
+            generator.next()
+        await generator.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,216 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from sqlalchemy import select, update
+
+from app.core.database import engine, AsyncSessionLocal
+from app.main import app
+from app.models import Product
+from app.services.idempotency import get_idempotency_store
+
+
+def order_body(*lines):
+    """Checkout payload for (product_id, quantity) lines"""
+    return {
+        "customer_name": "Rahim",
+        "customer_phone": "01711111111",
+        "customer_address": "House 1, Road 2, Dhaka",
+        "items": [{"product_id": product_id, "quantity": quantity} for product_id, quantity in lines],
+    }
+
+
+def stock_of(client, product_ids):
+    async def load():
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(Product.id, Product.stock_quantity).where(Product.id.in_(product_ids))
+            )
+            return dict(result.all())
+
+    return client.portal.call(load)
+
+
+def test_checkout_reserves_stock(client, store):
+    first, second = store.product_ids[:2]
+
+    response = client.post("/api/v1/orders", json=order_body((first, 3), (second, 1), (first, 2)), headers=store.headers)
+
+    assert response.status_code == 201
+    assert stock_of(client, [first, second]) == {first: 15, second: 19}
+
+
+def test_checkout_rejects_more_than_in_stock(client, store):
+    product_id = store.product_ids[0]
+
+    response = client.post("/api/v1/orders", json=order_body((product_id, 21)), headers=store.headers)
+
+    assert response.status_code == 400
+    assert stock_of(client, [product_id]) == {product_id: 20}
+
+
+def test_parallel_checkouts_never_oversell(client, store):
+    first, second = store.product_ids[:2]
+    # Carts list the same products in opposite orders, which could deadlock
+    # on Postgres (run with TEST_DATABASE_URL to exercise the row locks)
+    carts = [
+        order_body((first, 1), (second, 1)) if i % 2 else order_body((second, 1), (first, 1))
+        for i in range(30)
+    ]
+
+    async def checkout_all():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as parallel:
+            return await asyncio.gather(*[
+                parallel.post("/api/v1/orders", json=cart, headers=store.headers) for cart in carts
+            ])
+
+    responses = client.portal.call(checkout_all)
+    statuses = [response.status_code for response in responses]
+
+    assert set(statuses) <= {201, 400, 409}
+    assert statuses.count(201) == 20
+    assert stock_of(client, [first, second]) == {first: 0, second: 0}
+
+
+FLASH_SALE_ORDERS = 400
+FLASH_SALE_STOCK = 250
+
+
+@pytest.mark.skipif(engine.dialect.name != "postgresql", reason="Needs Postgres row locks to race")
+def test_flash_sale_sells_exactly_the_stock(client, store):
+    product_id = store.product_ids[0]
+
+    async def restock():
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(Product).where(Product.id == product_id).values(stock_quantity=FLASH_SALE_STOCK)
+            )
+            await session.commit()
+
+    client.portal.call(restock)
+    # Enough in flight to contend on the row, few enough for max_connections
+    in_flight = asyncio.Semaphore(50)
+
+    async def checkout_all():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as parallel:
+            async def checkout():
+                async with in_flight:
+                    return await parallel.post(
+                        "/api/v1/orders", json=order_body((product_id, 1)), headers=store.headers
+                    )
+
+            return await asyncio.gather(*[checkout() for _ in range(FLASH_SALE_ORDERS)])
+
+    started = time.perf_counter()
+    responses = client.portal.call(checkout_all)
+    elapsed = time.perf_counter() - started
+    statuses = [response.status_code for response in responses]
+
+    print(f"\n{FLASH_SALE_ORDERS} checkouts of one product in {elapsed:.2f}s: {FLASH_SALE_ORDERS / elapsed:.0f} orders/s")
+    assert statuses.count(201) == FLASH_SALE_STOCK
+    assert set(statuses) <= {201, 400}
+    assert stock_of(client, [product_id]) == {product_id: 0}
+
+
+def place_orders(client, store, count):
+    """Place count two-item orders; returns their ids"""
+    order_ids = []
+    for i in range(count):
+        cart = order_body((store.product_ids[i % 5], 1), (store.product_ids[(i + 1) % 5], 1))
+        response = client.post("/api/v1/orders", json=cart, headers=store.headers)
+        assert response.status_code == 201
+        order_ids.append(response.json()["id"])
+    return order_ids
+
+
+def test_order_lists_use_two_statements_whatever_the_page_size(client, store, statements):
+    place_orders(client, store, 12)
+    # Warm the per-worker caches (user status, shipping classes) first
+    client.get("/api/v1/orders?limit=1", headers=store.headers)
+
+    for url in ["/api/v1/orders?limit=2", "/api/v1/orders?limit=12", "/api/v1/orders/page?limit=2", "/api/v1/orders/page?limit=12"]:
+        statements.clear()
+        response = client.get(url, headers=store.headers)
+
+        assert response.status_code == 200
+        body = response.json()
+        orders = body["items"] if isinstance(body, dict) else body
+        assert all(len(order["items"]) == 2 for order in orders)
+        # The orders, then the items of the whole page in one IN query
+        assert len(statements) == 2, url
+
+
+def test_get_and_update_order_statement_counts(client, store, statements):
+    order_id = place_orders(client, store, 1)[0]
+    client.get("/api/v1/orders?limit=1", headers=store.headers)
+
+    statements.clear()
+    response = client.get(f"/api/v1/orders/{order_id}", headers=store.headers)
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 2
+    assert len(statements) == 2
+
+    statements.clear()
+    response = client.put(f"/api/v1/orders/{order_id}", json={"status": "confirmed"}, headers=store.headers)
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 2
+    # Order and items, then the UPDATE; nothing is read back afterwards
+    assert len(statements) == 3
+
+
+def test_idempotency_key_replays_the_first_order(client, store):
+    headers = {**store.headers, "Idempotency-Key": "checkout-1"}
+    cart = order_body((store.product_ids[0], 1))
+
+    first = client.post("/api/v1/orders", json=cart, headers=headers)
+    retry = client.post("/api/v1/orders", json=cart, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json()["id"] == first.json()["id"]
+    assert stock_of(client, [store.product_ids[0]]) == {store.product_ids[0]: 19}
+
+
+def test_order_is_returned_when_storing_the_idempotent_response_fails(client, store, monkeypatch):
+    idempotency_store = get_idempotency_store()
+
+    async def broken_complete(*args, **kwargs):
+        raise ConnectionError("redis went away")
+
+    monkeypatch.setattr(idempotency_store, "complete", broken_complete)
+
+    response = client.post(
+        "/api/v1/orders",
+        json=order_body((store.product_ids[0], 1)),
+        headers={**store.headers, "Idempotency-Key": "checkout-2"}
+    )
+
+    assert response.status_code == 201
+    assert response.json()["order_number"]
+
+
+def checkout_statements(client, store, statements, cart):
+    # Any earlier request puts the store in the tenant cache
+    client.get("/api/v1/shipping", headers=store.headers)
+    statements.clear()
+    response = client.post("/api/v1/orders", json=cart, headers=store.headers)
+    assert response.status_code == 201
+    return [statement.split()[0] for statement in statements]
+
+
+def test_checkout_round_trips(client, store, statements):
+    cart = order_body((store.product_ids[0], 2))
+
+    # Products, order, items, row locks and stock; the response is built
+    # from memory, so nothing is read back after the UPDATE
+    assert checkout_statements(client, store, statements, cart) == ["SELECT", "INSERT", "INSERT", "SELECT", "UPDATE"]
+
+
+@pytest.mark.skipif(engine.dialect.name != "postgresql", reason="SQLite inserts order items one row at a time")
+def test_checkout_round_trips_do_not_grow_with_the_cart(client, store, statements):
+    cart = order_body(*[(product_id, 1) for product_id in store.product_ids])
+
+    assert checkout_statements(client, store, statements, cart) == ["SELECT", "INSERT", "INSERT", "SELECT", "UPDATE"]
@@ -0,0 +1,110 @@
+import httpx
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.main import app
+from app.models import Product
+from app.services.product_import import IMPORT_BATCH_SIZE
+
+
+def import_file(client, store, body, import_format="csv"):
+    return client.post(
+        "/api/v1/products/import",
+        params={"format": import_format},
+        content=body.encode(),
+        headers={**store.headers, "Content-Type": "text/plain"}
+    )
+
+
+def slugs_of(client, store):
+    async def load():
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(Product.title, Product.slug).where(Product.tenant_id == store.tenant_id)
+            )
+            return dict(result.all())
+
+    return client.portal.call(load)
+
+
+def test_csv_import_reports_bad_rows_and_imports_the_rest(client, store):
+    body = (
+        "title,price,stock_quantity,images\n"
+        'Shirt,450,3,"https://a.example/1.jpg|https://a.example/2.jpg"\n'
+        "Cap,-1,1,\n"
+        '"Saree, silk",1200.50,2,\n'
+        "Product 0,99,1,\n"
+    )
+
+    response = import_file(client, store, body)
+
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["imported"], result["failed"]) == (3, 1)
+    assert result["errors"][0]["row"] == 3
+    assert result["errors"][0]["errors"][0]["field"] == "price"
+
+    slugs = slugs_of(client, store)
+    assert slugs["Saree, silk"] == "saree-silk"
+    # The fixture's products already use product-0
+    assert slugs["Product 0"] == "product-0-2"
+
+
+def test_jsonl_import(client, store):
+    body = '{"title": "Lamp", "price": "300"}\nnot json\n{"title": "Lamp!", "price": 310}\n'
+
+    response = import_file(client, store, body, "jsonl")
+
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["imported"], result["failed"]) == (2, 1)
+    assert result["errors"][0]["row"] == 2
+    slugs = slugs_of(client, store)
+    assert (slugs["Lamp"], slugs["Lamp!"]) == ("lamp", "lamp-2")
+
+
+def test_import_without_valid_rows_does_not_touch_the_products_table(client, store, statements):
+    # Any earlier request puts the store in the tenant cache
+    client.get("/api/v1/shipping", headers=store.headers)
+    statements.clear()
+
+    response = import_file(client, store, "title,price\nBroken,abc\n")
+
+    assert response.status_code == 200
+    assert response.json()["imported"] == 0
+    assert not [statement for statement in statements if "products" in statement]
+
+
+def test_the_database_is_not_used_until_the_whole_upload_is_in(client, store, statements):
+    client.get("/api/v1/shipping", headers=store.headers)
+    statements.clear()
+    # Several batches' worth, sent in chunks
+    rows = [f"Item {i},{100 + i}\n" for i in range(IMPORT_BATCH_SIZE + 500)]
+    seen_while_uploading = []
+
+    async def body():
+        yield b"title,price\n"
+        for start in range(0, len(rows), 100):
+            seen_while_uploading.extend(statements)
+            yield "".join(rows[start:start + 100]).encode()
+
+    async def upload():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as streaming:
+            return await streaming.post(
+                "/api/v1/products/import",
+                content=body(),
+                headers={**store.headers, "Content-Type": "text/plain"}
+            )
+
+    response = client.portal.call(upload)
+
+    assert response.status_code == 200
+    assert response.json()["imported"] == len(rows)
+    assert seen_while_uploading == []
+
+
+def test_import_rejects_unknown_columns(client, store):
+    response = import_file(client, store, "title,price,colour\nShirt,450,red\n")
+
+    assert response.status_code == 400
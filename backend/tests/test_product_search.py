@@ -0,0 +1,82 @@
+import pytest
+
+from app.core.database import engine, AsyncSessionLocal
+from app.models import Product
+from app.services import product_search
+
+pytestmark = pytest.mark.skipif(
+    engine.dialect.name != "postgresql", reason="Search uses Postgres full-text and pg_trgm"
+)
+
+
+def add_products(client, store, *products):
+    async def add():
+        async with AsyncSessionLocal() as session:
+            session.add_all([
+                Product(tenant_id=store.tenant_id, price=500, stock_quantity=1, **fields) for fields in products
+            ])
+            await session.commit()
+
+    client.portal.call(add)
+
+
+def search(client, store, q):
+    response = client.get("/api/v1/products/search", params={"q": q}, headers=store.headers)
+    assert response.status_code == 200
+    return [product["title"] for product in response.json()]
+
+
+@pytest.fixture
+def catalog(client, store):
+    add_products(
+        client,
+        store,
+        {"title": "Jamdani Saree", "title_bn": "জামদানি শাড়ি", "description": "Handwoven in Tangail"},
+        {"title": "Cotton Panjabi", "title_bn": "সুতি পাঞ্জাবি"},
+        {"title": "Leather Wallet", "description": "Genuine cowhide"},
+    )
+    return store
+
+
+def test_bangla_substring_matches(client, catalog):
+    # "দানি" only appears inside the word জামদানি
+    assert search(client, catalog, "দানি") == ["Jamdani Saree"]
+
+
+def test_bangla_title_words_match(client, catalog):
+    assert search(client, catalog, "পাঞ্জাবি") == ["Cotton Panjabi"]
+
+
+def test_descriptions_match(client, catalog):
+    assert search(client, catalog, "handwoven") == ["Jamdani Saree"]
+    assert search(client, catalog, "cowhide") == ["Leather Wallet"]
+
+
+def test_typos_match_titles(client, catalog):
+    if not product_search._trigram_available:
+        pytest.skip("pg_trgm is not installed")
+
+    assert search(client, catalog, "panjbi") == ["Cotton Panjabi"]
+
+
+def test_title_matches_rank_first(client, catalog):
+    if not product_search._trigram_available:
+        pytest.skip("pg_trgm is not installed")
+
+    add_products(client, catalog, {"title": "Saree Box", "description": "For a jamdani"})
+
+    assert search(client, catalog, "jamdani saree")[0] == "Jamdani Saree"
+
+
+def test_search_is_scoped_to_the_store(client, catalog, store_factory):
+    other = store_factory()
+    add_products(client, other, {"title": "Jamdani Dupatta"})
+
+    assert search(client, catalog, "jamdani") == ["Jamdani Saree"]
+    assert search(client, other, "jamdani") == ["Jamdani Dupatta"]
+
+
+def test_unpublished_products_are_not_found(client, store):
+    add_products(client, store, {"title": "Hidden Kurti", "is_published": False})
+
+    assert search(client, store, "kurti") == []
@@ -0,0 +1,27 @@
+def test_product_pages_cover_the_catalog_once(client, store):
+    seen = []
+    cursor = None
+
+    # Sorted by price: SQLite compares the timestamps of the default sort as text
+    for _ in range(len(store.product_ids)):
+        params = {"limit": 2, "sort": "price_asc", **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/v1/products/page", params=params, headers=store.headers)
+        assert response.status_code == 200
+        page = response.json()
+        seen += [product["id"] for product in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    else:
+        raise AssertionError("paging did not end")
+
+    assert seen == store.product_ids
+    assert len(seen) == len(set(seen))
+
+
+def test_unpaged_list_is_capped(client, store):
+    response = client.get("/api/v1/products", params={"limit": 3}, headers=store.headers)
+
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+    assert client.get("/api/v1/products", params={"limit": 501}, headers=store.headers).status_code == 422
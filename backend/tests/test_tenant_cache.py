@@ -0,0 +1,58 @@
+import asyncio
+
+from app.services.tenant_cache import TenantCache
+
+
+def test_waiters_load_the_tenant_themselves_when_the_loading_request_is_cancelled(monkeypatch):
+    cache = TenantCache()
+    loads = []
+
+    async def load(slug):
+        loads.append(slug)
+        if len(loads) == 1:
+            # The first request never gets an answer before it is cancelled
+            await asyncio.Event().wait()
+        return "tenant"
+
+    monkeypatch.setattr(cache, "_load", load)
+
+    async def scenario():
+        first = asyncio.create_task(cache.get_by_slug("shop"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.get_by_slug("shop"))
+        await asyncio.sleep(0)
+
+        first.cancel()
+
+        assert await asyncio.wait_for(second, 2) == "tenant"
+        assert first.cancelled()
+        assert loads == ["shop", "shop"]
+
+    asyncio.run(scenario())
+
+
+def test_a_cancelled_waiter_does_not_cancel_the_load(monkeypatch):
+    cache = TenantCache()
+
+    async def scenario():
+        loaded = asyncio.Event()
+
+        async def load(slug):
+            await loaded.wait()
+            return "tenant"
+
+        monkeypatch.setattr(cache, "_load", load)
+
+        first = asyncio.create_task(cache.get_by_slug("shop"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.get_by_slug("shop"))
+        await asyncio.sleep(0)
+
+        second.cancel()
+        await asyncio.sleep(0)
+        loaded.set()
+
+        assert await asyncio.wait_for(first, 2) == "tenant"
+        assert second.cancelled()
+
+    asyncio.run(scenario())
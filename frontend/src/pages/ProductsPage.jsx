@@ -4,22 +4,31 @@ import { useTranslation } from 'react-i18next'
 import api from '../utils/api'
 import toast from 'react-hot-toast'
 
+const PAGE_SIZE = 24
+
 const ProductsPage = () => {
   const { t } = useTranslation()
   const { storeId } = useParams()
   const [products, setProducts] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
 
   useEffect(() => {
     loadProducts()
   }, [storeId])
 
+  // One page at a time; pass the previous page's cursor to get the next one
+  const fetchPage = (cursor) =>
+    api.get('/products/page', { params: { limit: PAGE_SIZE, cursor: cursor || undefined } })
+
   const loadProducts = async () => {
     try {
       // Note: In production, this would use tenant context from subdomain
       // For now, we'll need to pass storeId in query or header
-      const response = await api.get('/products')
-      setProducts(response.data)
+      const response = await fetchPage(null)
+      setProducts(response.data.items)
+      setNextCursor(response.data.next_cursor)
       setLoading(false)
     } catch (error) {
       toast.error(t('common.error'))
@@ -27,6 +36,18 @@ const ProductsPage = () => {
     }
   }
 
+  const loadMore = async () => {
+    setLoadingMore(true)
+    try {
+      const response = await fetchPage(nextCursor)
+      setProducts((loaded) => [...loaded, ...response.data.items])
+      setNextCursor(response.data.next_cursor)
+    } catch (error) {
+      toast.error(t('common.error'))
+    }
+    setLoadingMore(false)
+  }
+
   const handleDelete = async (productId) => {
     if (!confirm('Are you sure?')) return
     
@@ -118,6 +139,18 @@ const ProductsPage = () => {
           ))}
         </div>
       )}
+
+      {nextCursor && (
+        <div className="text-center mt-8">
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="btn btn-secondary"
+          >
+            {loadingMore ? t('common.loading') : t('common.loadMore')}
+          </button>
+        </div>
+      )}
     </div>
   )
 }